@@ -1,8 +1,12 @@
+import importlib
 
-from .code import Calendar
-from .code import Date
-from .code import Rate
-from .code import DayCountBasis
-
+__all__ = ["Calendar", "Date", "Rate", "DayCountBasis", "HolidayRules", "Metrics", "Validation"]
 
 
+def __getattr__(name):
+    """Import submodules on first access so that importing the package stays cheap"""
+    if name in __all__:
+        module = importlib.import_module(f".code.{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
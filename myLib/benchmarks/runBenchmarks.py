@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for Calendar, DayCountBasis and Rate on a synthetic holiday fixture
+
+    python myLib/benchmarks/runBenchmarks.py --output results.json
+    python myLib/benchmarks/runBenchmarks.py --sizes 1,1000 --compare results.json
+    python myLib/benchmarks/runBenchmarks.py --only threads --threads 8
+
+Results are written as JSON (one record per benchmark, centre count and input size) so that runs can
+be compared with --compare, which prints the ratio of each timing to the baseline run.
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+# Ensure the code directory is in the sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'code')))
+
+from Calendar import Calendar
+from DayCountBasis import DayCountBasis
+from Rate import Rate, CompoundingFrequency, DayCountConvention
+
+centres = ["ZA", "US", "GB", "EG"]
+weekendTypes = {"ZA": "Saturday-Sunday", "US": "Saturday-Sunday", "GB": "Saturday-Sunday", "EG": "Friday-Saturday"}
+dayCountBases = ["act/365", "act/360", "act/act", "act/act afb", "30/360", "30/360e", "30/360ee"]
+defaultSizes = [1, 10, 100, 1000, 10000, 100000, 1000000]
+
+
+def writeFixture(directory, seed=0):
+    """Write a synthetic holiday CSV (about 12 holidays per country and year) and weekend CSV, returning their paths"""
+    rng = random.Random(seed)
+    holidayPath = os.path.join(directory, "holidays.csv")
+    weekendPath = os.path.join(directory, "weekends.csv")
+    with open(holidayPath, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "localName", "name", "countryCode", "extraction_date"])
+        for code in centres:
+            for year in range(2019, 2058):
+                holidays = {date(year, 1, 1), date(year, 12, 25)}
+                while len(holidays) < 12:
+                    holidays.add(date(year, 1, 1) + timedelta(days=rng.randint(0, 364)))
+                for holiday in sorted(holidays):
+                    writer.writerow([holiday.isoformat(), "Holiday", "Holiday", code, "2024-06-18 10:15:00"])
+    with open(weekendPath, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Country Code", "Weekend Type"])
+        writer.writerows(weekendTypes.items())
+    return holidayPath, weekendPath
+
+
+def timeCall(function, repeat):
+    """Return the timings in seconds of repeated calls to a function"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+class BenchmarkRunner:
+    def __init__(self, sizes, maxCentres, repeat, seed=0):
+        self.sizes = sizes
+        self.maxCentres = maxCentres
+        self.repeat = repeat
+        self.rng = np.random.default_rng(seed)
+        self.results = []
+
+    def record(self, name, centreCount, size, function):
+        """Time a benchmark and store its result; large inputs are repeated fewer times"""
+        repeat = self.repeat if size * self.repeat <= 1000000 else 1
+        timings = timeCall(function, repeat)
+        best = min(timings)
+        self.results.append({
+            "benchmark": name,
+            "centres": centreCount,
+            "size": size,
+            "repeat": repeat,
+            "best": best,
+            "median": float(np.median(timings)),
+            "perItem": best / size,
+        })
+        print(f"{name:<40} centres={centreCount} size={size:<8} best={best:.6f}s perItem={best / size * 1e9:,.0f}ns", flush=True)
+
+    def randomDates(self, size, start="2021-01-01", stop="2054-12-31"):
+        """Return random datetime64[D] dates between two dates"""
+        first, last = np.datetime64(start), np.datetime64(stop)
+        return first + self.rng.integers(0, (last - first).astype(int) + 1, size)
+
+    def runCalendar(self):
+        """Benchmark Calendar construction and queries for 1 to maxCentres centres"""
+        for centreCount in range(1, self.maxCentres + 1):
+            code = "+".join(centres[:centreCount])
+
+            def construct():
+                Calendar._sourceCache.clear()
+                Calendar._countryMaskCache.clear()
+                Calendar(code)
+            self.record("Calendar.__init__ (cold)", centreCount, 1, construct)
+            self.record("Calendar.__init__ (warm)", centreCount, 1, lambda: Calendar(code))
+
+            calendar = Calendar(code)
+            for size in self.sizes:
+                days = self.randomDates(size)
+                ends = self.randomDates(size)
+                starts, ends = np.minimum(days, ends), np.maximum(days, ends)
+                dates, startDates, endDates = days.astype(object), starts.astype(object), ends.astype(object)
+                offsets = self.rng.integers(-20, 21, size)
+                tenors = self.rng.choice(["1d", "1w", "1m", "3m", "6m", "1y"], size)
+
+                self.record("Calendar.isBusinessDay", centreCount, size,
+                            lambda: [calendar.isBusinessDay(day) for day in dates])
+                self.record("Calendar.isBusinessDayArray", centreCount, size,
+                            lambda: calendar.isBusinessDayArray(days))
+                self.record("Calendar.addBusinessDays", centreCount, size,
+                            lambda: [calendar.addBusinessDays(day, int(offset), "mf") for day, offset in zip(dates, offsets)])
+                self.record("Calendar.addBusinessDaysArray", centreCount, size,
+                            lambda: calendar.addBusinessDaysArray(days, offsets, "mf"))
+                self.record("Calendar.addTenor", centreCount, size,
+                            lambda: [calendar.addTenor(day, tenor, "mf", True) for day, tenor in zip(dates, tenors)])
+                self.record("Calendar.addTenorArray", centreCount, size,
+                            lambda: calendar.addTenorArray(days, tenors, "mf", True))
+                self.record("Calendar.numBusinessDaysBetween", centreCount, size,
+                            lambda: [calendar.numBusinessDaysBetween(start, end) for start, end in zip(startDates, endDates)])
+
+    def runThreads(self, maxThreads):
+        """Benchmark scalar queries on one calendar snapshot shared by 1 to maxThreads threads
+
+        Every thread count runs the same total number of queries, split evenly over the threads, so the
+        perItem timings of the thread counts show how far concurrent queries scale on this build.
+        """
+        centreCount = self.maxCentres
+        snapshot = Calendar("+".join(centres[:centreCount])).snapshot()
+        for size in self.sizes:
+            days = self.randomDates(size)
+            offsets = self.rng.integers(-20, 21, size)
+            dates = days.astype(object)
+
+            def query(part):
+                for day, offset in zip(dates[part], offsets[part]):
+                    snapshot.isBusinessDay(day)
+                    snapshot.addBusinessDays(day, int(offset), "mf")
+
+            threadCount = 1
+            while threadCount <= maxThreads:
+                parts = [slice(i, size, threadCount) for i in range(threadCount)]
+                with ThreadPoolExecutor(threadCount) as executor:
+                    self.record(f"Calendar.snapshot queries [{threadCount} threads]", centreCount, size,
+                                lambda: list(executor.map(query, parts)))
+                threadCount *= 2
+
+    def runDayCountBasis(self):
+        """Benchmark dayCountFraction for each of the calendar-day conventions"""
+        for size in self.sizes:
+            days = self.randomDates(size)
+            ends = self.randomDates(size)
+            startDates = np.minimum(days, ends).astype(object)
+            endDates = np.maximum(days, ends).astype(object)
+            for basis in dayCountBases:
+                dayCountBasis = DayCountBasis(basis)
+                self.record(f"DayCountBasis.dayCountFraction[{basis}]", 0, size,
+                            lambda: [dayCountBasis.dayCountFraction(start, end) for start, end in zip(startDates, endDates)])
+
+    def runRate(self):
+        """Benchmark Rate.equivalentRate and Rate.discountFactor"""
+        compoundings = list(CompoundingFrequency)
+        for size in self.sizes:
+            rates = self.rng.uniform(0.0, 0.2, size).tolist()
+            fromCompounding = [compoundings[i] for i in self.rng.integers(0, len(compoundings), size)]
+            toCompounding = [compoundings[i] for i in self.rng.integers(0, len(compoundings), size)]
+            days = self.randomDates(size)
+            ends = self.randomDates(size)
+            startDates = np.minimum(days, ends).astype(object)
+            endDates = np.maximum(days, ends).astype(object)
+            self.record("Rate.equivalentRate", 0, size,
+                        lambda: [Rate.equivalentRate(rate, source, DayCountConvention.ACT_365, target, DayCountConvention.ACT_360)
+                                 for rate, source, target in zip(rates, fromCompounding, toCompounding)])
+            self.record("Rate.discountFactor", 0, size,
+                        lambda: [Rate.discountFactor(rate, compounding, DayCountConvention.ACT_365, start, end)
+                                 for rate, compounding, start, end in zip(rates, fromCompounding, startDates, endDates)])
+
+
+def compare(results, baselinePath):
+    """Print the ratio of each best timing to the matching record of a baseline run"""
+    with open(baselinePath) as f:
+        baseline = {(r["benchmark"], r["centres"], r["size"]): r["best"] for r in json.load(f)["results"]}
+    for result in results:
+        key = (result["benchmark"], result["centres"], result["size"])
+        if key in baseline:
+            print(f"{result['benchmark']:<40} centres={result['centres']} size={result['size']:<8} ratio={result['best'] / baseline[key]:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(map(str, defaultSizes)), help="comma-separated input sizes")
+    parser.add_argument("--centres", type=int, default=len(centres), help="maximum number of calendar centres (1 to 4)")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats for small inputs")
+    parser.add_argument("--only", choices=["calendar", "daycount", "rate", "threads"], action="append", help="benchmark groups to run")
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1, help="maximum number of threads of the threads group")
+    parser.add_argument("--output", help="write the results as JSON to this path")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare against")
+    args = parser.parse_args(argv)
+    if not 1 <= args.centres <= len(centres):
+        parser.error(f"--centres must be between 1 and {len(centres)}")
+
+    runner = BenchmarkRunner([int(size) for size in args.sizes.split(",")], args.centres, args.repeat)
+    groups = args.only or ["calendar", "daycount", "rate"]
+    with tempfile.TemporaryDirectory() as directory:
+        Calendar.holidayPath, Calendar.weekendPath = writeFixture(directory)
+        if "calendar" in groups:
+            runner.runCalendar()
+        if "daycount" in groups:
+            runner.runDayCountBasis()
+        if "rate" in groups:
+            runner.runRate()
+        if "threads" in groups:
+            runner.runThreads(args.threads)
+
+    output = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            # False on free-threaded builds running without the GIL
+            "gil": getattr(sys, "_is_gil_enabled", lambda: True)(),
+            "sizes": runner.sizes,
+        },
+        "results": runner.results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=1)
+    if args.compare:
+        compare(runner.results, args.compare)
+    return output
+
+
+if __name__ == "__main__":
+    main()
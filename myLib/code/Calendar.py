@@ -1,70 +1,508 @@
-import pandas as pd
-from datetime import date, timedelta
-from dateutil.relativedelta import relativedelta
+import os
+import threading
+import weakref
+import numpy as np
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+try:
+    from . import Validation
+    from .Metrics import Metrics, currentMetrics, instrument, register
+except ImportError:
+    import Validation
+    from Metrics import Metrics, currentMetrics, instrument, register
 #import calendar
 
+# pandas is imported inside the methods that parse CSVs or build DataFrames, so that calendars loaded
+# from a compiled file (and modules that only need Calendar.validateDateRange) do not pay for it
+
 class Calendar:
-    retrievalDatetime = None
-    availableCountries = None 
+    # Calendars keep all of their query state in NumPy arrays and plain attributes set at construction,
+    # and query methods only read them, so they need no locks. A calendar returned by snapshot() is
+    # frozen: its arrays are read-only and shared without copying, and it can be queried concurrently
+    # from any number of threads with lock-free reads (while metrics are enabled every measured call
+    # takes the Metrics lock). The "threads" benchmark group of runBenchmarks.py measures how such
+    # queries scale with the number of threads on a given build. addHoliday/removeHoliday must not run
+    # concurrently with queries on the same live calendar; take a new snapshot after patching instead.
+    # Calendar.get hands out snapshots of the shared calendars, and Calendar.patch patches a shared
+    # calendar under the registry lock and publishes a new snapshot, so readers never see a half patch.
+    retrievalDatetime = None  # Set per instance from the extraction date of its holiday data
+    availableCountries = None  # Set per instance to the countries available in its source
     validDateRange = (date(2020, 1, 1), date(2056, 12, 31))  # Valid date range
+    holidayPath = "nager_public_holidays.csv"
+    weekendPath = "country_weekend_types.csv"
+    compiledPath = None  # Set to a file written by Calendar.compile to load calendars without parsing CSVs
+    holidaySource = None  # Set per instance to a rule-based source (see HolidayRules) instead of the files
+    metrics = None  # Set per instance by enableMetrics to collect metrics for one calendar (see Metrics)
+
+    # Parsed source files keyed by (path, modification time), and shared calendars keyed by country codes
+    # and join as (source keys, live calendar, published snapshot); the lock serializes rebuilds and patches
+    _sourceCache = {}
+    _registry = {}
+    _registryLock = threading.RLock()
+
+    # Read-only weekend and business-day masks per country, keyed by (code, first ordinal, number of days,
+    # source keys) and kept in least recently used order; joint calendars combine them bitwise. Rule
+    # sources are keyed by a weak reference, so the cache does not keep them alive
+    _countryMaskCache = {}
+    countryMaskCacheSize = 64
+
+    # Custom ranges of rule-based calendars are generated and tabulated in full at construction, so
+    # their length is bounded
+    maxValidDateRangeYears = 200
+
+    # Join semantics for joint calendars: a day is closed if any centre is closed (the default), or
+    # closed only if all centres are closed
+    validJoins = ("any-closed", "all-closed")
+
+    # Endpoints counted by numBusinessDaysBetween, as in pandas: both dates, only the start, only the end, or neither
+    validInclusive = ("both", "left", "right", "neither")
+
+    # Layout of compiled calendar files: a header, a country table, packed business-day bitmaps per
+    # country, then the holiday ordinals, their rows in the source CSV, the name offsets, the weekend
+    # masks by effective date and finally the UTF-8 holiday names
+    _compiledMagic = b"MYLIBCAL"
+    _compiledVersion = 2
+    _compiledHeaderType = np.dtype([("magic", "S8"), ("version", "<u4"), ("numCountries", "<u4"),
+                                    ("firstOrdinal", "<i8"), ("numDays", "<i8"), ("numHolidays", "<i8"),
+                                    ("numWeekends", "<i8")])
+    _compiledCountryType = np.dtype([("code", "S8"), ("weekendBits", "u1"), ("extraction", "<i8"),
+                                     ("firstRow", "<i8"), ("holidayStart", "<i8"), ("holidayCount", "<i8"),
+                                     ("weekendStart", "<i8"), ("weekendCount", "<i8")])
+    _unknownWeekendBit = 0x80
 
-    def __init__(self, countryCode):
+    weekdayNames = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+    def __init__(self, countryCode, join="any-closed", holidaySource=None, validDateRange=None):
         self.countryCodes = [code.upper() for code in countryCode.split("+")]
-        self.holidayData = self.loadHoliday("nager_public_holidays.csv", self.countryCodes)
-        self.weekendTypes = self.loadWeekend("country_weekend_types.csv")
-    
+        self.join = self.validateJoin(join)
+        self.version = 0  # Bumped by every addHoliday/removeHoliday so dependent caches can detect changes
+        self._frozen = False
+        if validDateRange is not None:
+            # The CSV and compiled data only cover the class-wide range; rule-based sources can generate any year
+            if holidaySource is None:
+                raise ValueError("A custom validDateRange requires a rule-based holidaySource")
+            if not validDateRange[0] <= validDateRange[1]:
+                raise ValueError("Start date must be before end date")
+            if validDateRange[1].year - validDateRange[0].year >= self.maxValidDateRangeYears:
+                raise ValueError(f"A custom validDateRange may span at most {self.maxValidDateRangeYears} years")
+            self.validDateRange = (validDateRange[0], validDateRange[1])
+        if holidaySource is not None:
+            self.validateCountryCode(holidaySource.countries, None, self.countryCodes)
+            self.holidaySource = holidaySource
+            self._holidayData = None
+            self.weekendTypes = {code: holidaySource.weekendDays(code) for code in dict.fromkeys(self.countryCodes)}
+            self.weekendHistory = {code: (np.zeros(1, dtype=np.int64), np.array([sum(1 << day for day in days)], dtype=np.uint8))
+                                   for code, days in self.weekendTypes.items()}
+            self.availableCountries = holidaySource.countries
+            self.retrievalDatetime = None
+        elif self.compiledPath is None:
+            self.holidayData = self.loadHoliday(self.holidayPath, self.countryCodes)
+            self.weekendTypes = self.loadWeekend(self.weekendPath)
+            self.weekendHistory = self.loadWeekendHistory(self.weekendPath)
+            source = self._loadSource(self.holidayPath, self._parseHolidayFile)
+            self.availableCountries = source["countries"]
+            self.retrievalDatetime = min(source["retrieval"][code] for code in self.countryCodes)[1]
+        else:
+            self._holidayData = None
+            self.weekendTypes, self.weekendHistory, self.retrievalDatetime = self.loadCompiled(self.compiledPath, self.countryCodes)
+            self.availableCountries = frozenset(self._loadSource(self.compiledPath, self._parseCompiledFile)["countries"])
+        self._buildBusinessDayIndex()
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"Calendar snapshot is frozen: cannot set '{name}'")
+        object.__setattr__(self, name, value)
+
+    @property
+    def frozen(self):
+        """Whether the calendar is a frozen snapshot"""
+        return self._frozen
+
+    def enableMetrics(self, metrics=None):
+        """Collect metrics for this calendar only, returning the Metrics that collects them"""
+        # Metrics are not query state, so they can be enabled on frozen snapshots as well
+        object.__setattr__(self, "metrics", metrics or Metrics())
+        register(self)
+        return self.metrics
+
+    def disableMetrics(self):
+        """Stop collecting metrics for this calendar, returning the Metrics that collected them"""
+        metrics = self.metrics
+        object.__setattr__(self, "metrics", None)
+        register(self)
+        return metrics
+
+    def snapshot(self):
+        """Return a frozen copy of the calendar that shares its arrays read-only and is safe to query from any thread"""
+        if self._frozen:
+            return self
+        # Freezing the shared arrays makes the next addHoliday/removeHoliday on this calendar copy them first
+        for array in (self._weekendMask, self._businessDayMask, self._businessDayCount, self._businessDayPositions,
+                      self._nextBusinessIndex, self._previousBusinessIndex, self._firstBusinessIndexInMonth,
+                      self._lastBusinessIndexInMonth):
+            if array is not None:
+                array.flags.writeable = False
+        if not self._missingWeekendCodes:
+            for mask in self._countryBusinessDayMasks.values():
+                mask.flags.writeable = False
+        snapshot = object.__new__(type(self))
+        snapshot.__dict__.update(self.__dict__)
+        snapshot.__dict__.update(countryCodes=tuple(self.countryCodes), weekendTypes=dict(self.weekendTypes),
+                                 weekendHistory=dict(self.weekendHistory), _frozen=True)
+        if not self._missingWeekendCodes:
+            snapshot.__dict__.update(_countryWeekendMasks=dict(self._countryWeekendMasks),
+                                     _countryBusinessDayMasks=dict(self._countryBusinessDayMasks))
+        if snapshot.metrics is not None:
+            register(snapshot)
+        return snapshot
+
+    @property
+    def holidayData(self):
+        """Holiday dates, names and country codes as a DataFrame (built on first use for compiled calendars)"""
+        if self._holidayData is None:
+            # Snapshots may build this lazily too; concurrent builds produce equal frames, so the race is benign
+            if self.holidaySource is not None:
+                holidayData = self.loadRuleHoliday(self.holidaySource, self.countryCodes, self.validDateRange)
+            else:
+                holidayData = self.loadCompiledHoliday(self.compiledPath, self.countryCodes)
+            object.__setattr__(self, "_holidayData", holidayData)
+        return self._holidayData
+
+    @holidayData.setter
+    def holidayData(self, holidayData):
+        self._holidayData = holidayData
+
     @classmethod
-    def loadHoliday(cls, path, countryCodes):
-        """Load holiday data from CSV"""
+    def get(cls, countryCode, join="any-closed"):
+        """Return a frozen snapshot of the shared Calendar for the given country codes, rebuilding it only when the source files change"""
+        key = (tuple(code.upper() for code in countryCode.split("+")), cls.validateJoin(join))
+        sourceKeys = cls._sourceKeys()
+        entry = cls._registry.get(key)
+        if entry is None or entry[0] != sourceKeys:
+            with cls._registryLock:
+                entry = cls._registryEntry(key, sourceKeys)
+        return entry[2]
+
+    @classmethod
+    @contextmanager
+    def patch(cls, countryCode, join="any-closed"):
+        """Patch the shared Calendar for the given country codes, publishing a new snapshot to get when the block exits
+
+            with Calendar.patch("ZA+US") as calendar:
+                calendar.addHoliday(date(2024, 6, 18), "Storm closure", "ZA")
+
+        Callers holding earlier snapshots keep querying them unchanged. Patches last until the source files change.
+        """
+        key = (tuple(code.upper() for code in countryCode.split("+")), cls.validateJoin(join))
+        with cls._registryLock:
+            sourceKeys, calendar, _ = cls._registryEntry(key, cls._sourceKeys())
+            try:
+                yield calendar
+            finally:
+                # The published snapshot freezes the arrays, so the next patch copies them before changing them
+                cls._registry[key] = (sourceKeys, calendar, calendar.snapshot())
+
+    @classmethod
+    def _registryEntry(cls, key, sourceKeys):
+        """Return the registry entry of a key, building the calendar if it is missing or stale (call with the registry lock held)"""
+        entry = cls._registry.get(key)
+        if entry is None or entry[0] != sourceKeys:
+            if currentMetrics(cls) is not None:
+                currentMetrics(cls).recordMiss("Calendar.get")
+            calendar = cls("+".join(key[0]), key[1])
+            entry = cls._registry[key] = (sourceKeys, calendar, calendar.snapshot())
+        return entry
+
+    @classmethod
+    def _sourceKeys(cls):
+        """Return the keys of the source files calendars are currently built from"""
+        if cls.compiledPath is None:
+            return (cls._sourceKey(cls.holidayPath), cls._sourceKey(cls.weekendPath))
+        return (cls._sourceKey(cls.compiledPath),)
+
+    @classmethod
+    def validateJoin(cls, join):
+        """Validate the join semantics of a joint calendar"""
+        if not isinstance(join, str) or join.lower() not in cls.validJoins:
+            raise ValueError(f"Invalid join: '{join}'. Expected 'any-closed' or 'all-closed'.")
+        return join.lower()
+
+    @staticmethod
+    def _sourceKey(path):
+        """Identify a source file by its absolute path and modification time"""
+        path = os.path.abspath(path)
+        return path, os.stat(path).st_mtime_ns
+
+    @classmethod
+    def _loadSource(cls, path, parser):
+        """Parse a source file once per process, re-parsing only if the file has been modified"""
+        key = (parser.__name__,) + cls._sourceKey(path)
+        source = cls._sourceCache.get(key)
+        if source is None:
+            if currentMetrics(cls) is not None:
+                currentMetrics(cls).recordMiss("Calendar._loadSource")
+            source = parser(key[1])
+            # Drop any stale parse of the same file before caching the new one
+            for staleKey in [k for k in cls._sourceCache if k[:2] == key[:2]]:
+                del cls._sourceCache[staleKey]
+            cls._sourceCache[key] = source
+        return source
+
+    @staticmethod
+    def _parseHolidayFile(path):
+        """Parse the holiday CSV into per-country holiday frames, read-only ordinals and extraction timestamps"""
+        import pandas as pd
         holidaysDf = pd.read_csv(path)
         holidaysDf["date"] = pd.to_datetime(holidaysDf['date']).dt.date
+        byCountry, ordinals, retrieval = {}, {}, {}
+        for code, frame in holidaysDf.groupby("countryCode", sort=False):
+            byCountry[code] = frame[['date', 'name', 'countryCode']]
+            ordinals[code] = np.array([holiday.toordinal() for holiday in frame["date"]], dtype=np.int64)
+            ordinals[code].flags.writeable = False
+            # Keep the file position of the first row so joint calendars report the same timestamp as before
+            retrieval[code] = (frame.index[0], pd.to_datetime(frame['extraction_date'].iloc[0]))
+        return {
+            "countries": frozenset(byCountry),
+            "byCountry": byCountry,
+            "ordinals": ordinals,
+            "retrieval": retrieval,
+        }
+
+    @classmethod
+    def weekendMaskFromType(cls, weekendType):
+        """Convert a weekend type such as "Saturday-Sunday", "Friday", "Fri,Sun", "None" or 96 into a 7-bit weekday mask"""
+        if isinstance(weekendType, (int, np.integer)) or str(weekendType).strip().isdigit():
+            mask = int(str(weekendType).strip())
+            if not 0 <= mask < 128:
+                raise ValueError(f"Unknown weekend type: {weekendType}")
+            return mask
+
+        # Only an explicit "None" means no weekend; blank or missing types are errors, not weekend-free countries
+        weekendType = str(weekendType).strip().lower()
+        if weekendType == "none":
+            return 0
+        days = {name.lower()[:length]: day for day, name in enumerate(cls.weekdayNames) for length in (3, len(name))}
+        mask = 0
+        for part in weekendType.replace("+", ",").split(","):
+            # "Day-Day" is an inclusive range of weekdays, wrapping past Sunday
+            bounds = [days.get(bound.strip()) for bound in part.split("-")]
+            if len(bounds) > 2 or None in bounds:
+                raise ValueError(f"Unknown weekend type: {weekendType}")
+            for offset in range((bounds[-1] - bounds[0]) % 7 + 1):
+                mask |= 1 << ((bounds[0] + offset) % 7)
+        return mask
+
+    @classmethod
+    def _parseWeekendFile(cls, path):
+        """Parse the weekend CSV into per-country weekend masks by effective date and the weekdays currently in effect"""
+        import pandas as pd
+        weekendData = pd.read_csv(path)
+
+        # Weekend types repeat across countries, so each distinct type is parsed once and mapped in one pass
+        weekendTypes = weekendData["Weekend Type"]
+        masks = weekendTypes.map({weekendType: cls.weekendMaskFromType(weekendType) for weekendType in weekendTypes.unique()})
+        # Rows without an effective date apply from the start of time
+        if "Effective Date" in weekendData:
+            effective = pd.to_datetime(weekendData["Effective Date"]).dt.date.map(lambda day: day.toordinal(), na_action="ignore")
+            effective = effective.fillna(0).to_numpy(dtype=np.int64)
+        else:
+            effective = np.zeros(len(weekendData), dtype=np.int64)
+
+        codes = weekendData["Country Code"].to_numpy(dtype=str)
+        order = np.lexsort((effective, codes))
+        codes, effective, masks = codes[order], effective[order], masks.to_numpy(dtype=np.uint8)[order]
+        effective.flags.writeable = False
+        masks.flags.writeable = False
+        uniqueCodes, starts = np.unique(codes, return_index=True)
+        history, current = {}, {}
+        for code, start, stop in zip(uniqueCodes, starts, list(starts[1:]) + [len(codes)]):
+            history[code] = (effective[start:stop], masks[start:stop])
+            current[code] = tuple(day for day in range(7) if masks[stop - 1] & (1 << day))
+        return {"history": history, "current": current}
+
+    @classmethod
+    def loadHoliday(cls, path, countryCodes):
+        """Load holiday data from CSV"""
+        import pandas as pd
+        source = cls._loadSource(path, cls._parseHolidayFile)
         
         # Validate country codes
-        cls.validateCountryCode(cls.availableCountries, holidaysDf, countryCodes)
+        cls.validateCountryCode(source["countries"], None, countryCodes)
         
-        # Filter holidays for specified country codes
-        holidaysDf = holidaysDf[holidaysDf['countryCode'].isin(countryCodes)]
-        
-        Calendar.retrievalDatetime = pd.to_datetime(holidaysDf['extraction_date']).iloc[0]
+        # Combine the holidays for the specified country codes, keeping the file order
+        countryCodes = list(dict.fromkeys(countryCodes))
+        if len(countryCodes) == 1:
+            holidaysDf = source["byCountry"][countryCodes[0]].copy()
+        else:
+            holidaysDf = pd.concat([source["byCountry"][code] for code in countryCodes]).sort_index()
         
-        return holidaysDf[['date', 'name', 'countryCode']]
+        return holidaysDf
 
     
     @classmethod
     def loadWeekend(cls, path):
         """Load weekend data from CSV"""
-        weekendData = pd.read_csv(path)
-        weekendMapping = {
-            "Saturday-Sunday": (5, 6),
-            "Friday-Saturday": (4, 5),
-            "Thursday-Friday": (3, 4)
-        }
+        return dict(cls._loadSource(path, cls._parseWeekendFile)["current"])
 
-        # Map weekend types to country codes
-        countryWeekends = {}
-        for _, row in weekendData.iterrows():
-            countryCode = row["Country Code"]
-            weekendType = row["Weekend Type"]
-            if weekendType in weekendMapping:
-                countryWeekends[countryCode] = weekendMapping[weekendType]
-            else:
-                raise ValueError(f"Unknown weekend type: {weekendType}")
-        
-        return countryWeekends
+    @classmethod
+    def loadWeekendHistory(cls, path):
+        """Load each country's weekend masks and the ordinals of the dates they take effect from CSV"""
+        return dict(cls._loadSource(path, cls._parseWeekendFile)["history"])
         
+    @classmethod
+    def compile(cls, outputPath, holidayPath=None, weekendPath=None):
+        """Compile the holiday and weekend CSVs into a binary file of per-country business-day bitmaps"""
+        holidays = cls._loadSource(holidayPath or cls.holidayPath, cls._parseHolidayFile)
+        weekends = cls._loadSource(weekendPath or cls.weekendPath, cls._parseWeekendFile)
+        startRange, endRange = cls.validDateRange
+        firstOrdinal = startRange.toordinal()
+        numDays = endRange.toordinal() - firstOrdinal + 1
+
+        codes = sorted(holidays["countries"])
+        countries = np.zeros(len(codes), dtype=cls._compiledCountryType)
+        bitmaps = np.zeros((len(codes), (numDays + 7) // 8), dtype=np.uint8)
+        ordinals, rows, names, weekendEffective, weekendMasks = [], [], [], [], []
+        holidayStart = weekendStart = 0
+        for i, code in enumerate(codes):
+            mask = np.ones(numDays, dtype=bool)
+            history = weekends["history"].get(code, (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint8)))
+            if code in weekends["current"]:
+                mask &= ~cls._weekendMaskArray(history, firstOrdinal, numDays)
+                weekendBits = sum(1 << day for day in weekends["current"][code])
+            else:
+                weekendBits = cls._unknownWeekendBit
+            holidayIndex = holidays["ordinals"][code] - firstOrdinal
+            mask[holidayIndex[(holidayIndex >= 0) & (holidayIndex < numDays)]] = False
+            bitmaps[i] = np.packbits(mask)
+
+            frame = holidays["byCountry"][code]
+            firstRow, extraction = holidays["retrieval"][code]
+            countries[i] = (code.encode(), weekendBits, extraction.value, firstRow, holidayStart, len(frame),
+                            weekendStart, len(history[0]))
+            ordinals.append(holidays["ordinals"][code])
+            rows.append(frame.index.to_numpy(dtype=np.int64))
+            names.extend(name.encode("utf-8") for name in frame["name"].astype(str))
+            weekendEffective.append(history[0])
+            weekendMasks.append(history[1])
+            holidayStart += len(frame)
+            weekendStart += len(history[0])
+
+        nameOffsets = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum([len(name) for name in names], out=nameOffsets[1:])
+        header = np.array([(cls._compiledMagic, cls._compiledVersion, len(codes), firstOrdinal, numDays, holidayStart,
+                            weekendStart)], dtype=cls._compiledHeaderType)
+        with open(outputPath, "wb") as f:
+            for section in (header, countries, bitmaps, np.concatenate(ordinals).astype("<i4"),
+                            np.concatenate(rows).astype("<i8"), nameOffsets.astype("<i8"),
+                            np.concatenate(weekendEffective).astype("<i8"), np.concatenate(weekendMasks).astype(np.uint8)):
+                f.write(section.tobytes())
+            f.write(b"".join(names))
+
+    @classmethod
+    def _parseCompiledFile(cls, path):
+        """Memory-map a compiled calendar file and expose its sections as read-only array views"""
+        data = np.memmap(path, dtype=np.uint8, mode="r")
+        header = np.frombuffer(data, cls._compiledHeaderType, 1)[0]
+        if header["magic"] != cls._compiledMagic or header["version"] != cls._compiledVersion:
+            raise ValueError(f"Not a compiled calendar file (version {cls._compiledVersion}): {path}")
+        numCountries, numDays, numHolidays = int(header["numCountries"]), int(header["numDays"]), int(header["numHolidays"])
+        numWeekends = int(header["numWeekends"])
+
+        offset = cls._compiledHeaderType.itemsize
+        sections = []
+        for dtype, count in ((cls._compiledCountryType, numCountries), (np.uint8, numCountries * ((numDays + 7) // 8)),
+                             ("<i4", numHolidays), ("<i8", numHolidays), ("<i8", numHolidays + 1),
+                             ("<i8", numWeekends), (np.uint8, numWeekends)):
+            sections.append(np.frombuffer(data, dtype, count, offset))
+            offset += sections[-1].nbytes
+        countries, bitmaps, ordinals, rows, nameOffsets, weekendEffective, weekendMasks = sections
+        return {
+            "firstOrdinal": int(header["firstOrdinal"]),
+            "numDays": numDays,
+            "countries": {code.decode(): i for i, code in enumerate(countries["code"])},
+            "countryTable": countries,
+            "bitmaps": bitmaps.reshape(numCountries, -1),
+            "ordinals": ordinals,
+            "rows": rows,
+            "nameOffsets": nameOffsets,
+            "weekendEffective": weekendEffective,
+            "weekendMasks": weekendMasks,
+            "names": data[offset:],
+        }
+
+    @classmethod
+    def loadCompiled(cls, path, countryCodes):
+        """Load the weekend types, weekend history and retrieval datetime for the given country codes from a compiled calendar file"""
+        compiled = cls._loadSource(path, cls._parseCompiledFile)
+        startRange, endRange = cls.validDateRange
+        if (compiled["firstOrdinal"], compiled["numDays"]) != (startRange.toordinal(), endRange.toordinal() - startRange.toordinal() + 1):
+            raise ValueError(f"Compiled calendar {path} does not cover the valid range: {startRange} to {endRange}")
+        cls.validateCountryCode(compiled["countries"], None, countryCodes)
+
+        weekendTypes, weekendHistory, retrieval = {}, {}, []
+        for code in dict.fromkeys(countryCodes):
+            country = compiled["countryTable"][compiled["countries"][code]]
+            if not country["weekendBits"] & cls._unknownWeekendBit:
+                weekendTypes[code] = tuple(day for day in range(7) if country["weekendBits"] & (1 << day))
+                start, stop = int(country["weekendStart"]), int(country["weekendStart"] + country["weekendCount"])
+                weekendHistory[code] = (compiled["weekendEffective"][start:stop], compiled["weekendMasks"][start:stop])
+            retrieval.append((int(country["firstRow"]), int(country["extraction"])))
+
+        retrievalDatetime = datetime(1970, 1, 1) + timedelta(microseconds=min(retrieval)[1] // 1000)
+        return weekendTypes, weekendHistory, retrievalDatetime
+
+    @classmethod
+    def loadCompiledHoliday(cls, path, countryCodes):
+        """Load holiday data for the given country codes from a compiled calendar file"""
+        import pandas as pd
+        compiled = cls._loadSource(path, cls._parseCompiledFile)
+        cls.validateCountryCode(compiled["countries"], None, countryCodes)
+
+        frames = []
+        for code in dict.fromkeys(countryCodes):
+            country = compiled["countryTable"][compiled["countries"][code]]
+            start, stop = int(country["holidayStart"]), int(country["holidayStart"] + country["holidayCount"])
+            nameOffsets = compiled["nameOffsets"][start:stop + 1]
+            names = bytes(compiled["names"][nameOffsets[0]:nameOffsets[-1]])
+            nameOffsets = nameOffsets - nameOffsets[0]
+            days = np.datetime64("0001-01-01") + (compiled["ordinals"][start:stop] - 1).astype("timedelta64[D]")
+            frames.append(pd.DataFrame({
+                "date": days.astype(object),
+                "name": [names[a:b].decode("utf-8") for a, b in zip(nameOffsets[:-1], nameOffsets[1:])],
+                "countryCode": code,
+            }, index=compiled["rows"][start:stop].copy()))
+
+        return frames[0] if len(frames) == 1 else pd.concat(frames).sort_index()
+
+    @staticmethod
+    def loadRuleHoliday(holidaySource, countryCodes, validDateRange):
+        """Generate holiday data for the given country codes over a date range from a rule-based source"""
+        import pandas as pd
+        startRange, endRange = validDateRange
+        holidays = [(holiday, name, code) for code in dict.fromkeys(countryCodes)
+                    for holiday, name in holidaySource.holidaysBetween(code, startRange, endRange)]
+        return pd.DataFrame(holidays, columns=["date", "name", "countryCode"])
+
     @classmethod
     def validateCountryCode(cls, availableCountries, holidaysDf, countryCodes):
         """Validate if country codes are in the available country list"""
-        availableCountries = set(holidaysDf["countryCode"].unique())
+        if availableCountries is None:
+            availableCountries = set(holidaysDf["countryCode"].unique())
         invalidCountryCodes = [cc for cc in countryCodes if cc not in availableCountries]
         if invalidCountryCodes:
             raise ValueError("Invalid Country code ", invalidCountryCodes)
         return countryCodes
 
     @staticmethod
-    def validateDateRange(startDate, endDate=None):
+    def validateDateRange(startDate, endDate=None, validRange=None):
         """Validate if given dates are within the valid range and that startDate is before endDate"""
-        startRange, endRange = Calendar.validDateRange
+        startRange, endRange = validRange or Calendar.validDateRange
+        if Validation.isTrusted():
+            # The caller validated its dates once at the batch boundary (see Validation.trusted), but the
+            # order of each pair is still checked
+            if endDate and startDate > endDate:
+                raise ValueError("Start date must be before end date")
+            return endDate if endDate else endRange
         
         if not (startRange <= startDate <= endRange):
             raise ValueError(f"Start date {startDate} is out of the valid range: {startRange} to {endRange}")
@@ -79,120 +517,490 @@ class Calendar:
         
         return endDate
     
+    def _checkDateRange(self, startDate, endDate=None):
+        """Validate dates against this calendar's valid range"""
+        return self.validateDateRange(startDate, endDate, self.validDateRange)
+
+    def _raiseOutOfRange(self, givenDate):
+        """Raise the ValueError for a date outside this calendar's valid range, also in trusted mode"""
+        startRange, endRange = self.validDateRange
+        raise ValueError(f"Start date {givenDate} is out of the valid range: {startRange} to {endRange}")
+
+    def _buildBusinessDayIndex(self):
+        """Precompute weekend and business-day masks indexed by day ordinal over the valid date range"""
+        startRange, endRange = self.validDateRange
+        self._firstOrdinal = startRange.toordinal()
+        self._firstDay = np.datetime64(startRange, "D")
+        self._numDays = endRange.toordinal() - self._firstOrdinal + 1
+        self._missingWeekendCodes = [code for code in self.countryCodes if code not in self.weekendTypes]
+        if self._missingWeekendCodes:
+            self._weekendMask = None
+            self._businessDayMask = None
+            self._businessDayCount = None
+            self._businessDayPositions = None
+            self._nextBusinessIndex = None
+            self._previousBusinessIndex = None
+            self._firstBusinessIndexInMonth = None
+            self._lastBusinessIndexInMonth = None
+            return
+
+        # A rule source's version changes whenever a country is re-registered, which invalidates its cached masks
+        if self.holidaySource is None:
+            sourceKeys = self._sourceKeys()
+        else:
+            sourceKeys = (weakref.ref(self.holidaySource), self.holidaySource.version)
+        weekendMasks, businessDayMasks = zip(*(self._countryMasks(code, sourceKeys) for code in dict.fromkeys(self.countryCodes)))
+        # The cached masks are shared and read-only; addHoliday/removeHoliday copy a country's mask before patching it
+        self._countryWeekendMasks = dict(zip(dict.fromkeys(self.countryCodes), weekendMasks))
+        self._countryBusinessDayMasks = dict(zip(dict.fromkeys(self.countryCodes), businessDayMasks))
+        if self.join == "any-closed":
+            self._weekendMask = np.logical_or.reduce(weekendMasks)
+            self._businessDayMask = np.logical_and.reduce(businessDayMasks)
+        else:
+            self._weekendMask = np.logical_and.reduce(weekendMasks)
+            self._businessDayMask = np.logical_or.reduce(businessDayMasks)
+
+        # _businessDayCount[i] is the number of business days strictly before index i
+        self._businessDayCount = np.zeros(self._numDays + 1, dtype=np.int64)
+        np.cumsum(self._businessDayMask, out=self._businessDayCount[1:])
+        self._businessDayPositions = np.flatnonzero(self._businessDayMask)
+
+        # _nextBusinessIndex[i] / _previousBusinessIndex[i] are the first business day on or after / the last
+        # on or before index i. The extra last slot holds the out-of-range sentinel, so looking up one past
+        # the end (numDays) or one before the start (-1, which wraps to the last slot) finds no business day
+        self._nextBusinessIndex = np.full(self._numDays + 1, self._numDays, dtype=np.int64)
+        self._previousBusinessIndex = np.full(self._numDays + 1, -1, dtype=np.int64)
+        self._refreshRollTables(0, self._numDays)
+
+        # _monthStartIndex[m] is the index of the 1st of the m-th month of the range (the last entry is the
+        # month after the range). The month tables hold the first business day on or after the 1st and the
+        # last on or before the month end, with -1 / numDays where the month runs out of the range
+        self._firstMonth = np.datetime64(startRange, "M")
+        numMonths = int((np.datetime64(endRange, "M") - self._firstMonth).astype(np.int64)) + 1
+        self._monthStartIndex = ((self._firstMonth + np.arange(numMonths + 1)).astype("datetime64[D]") - self._firstDay).astype(np.int64)
+        self._firstBusinessIndexInMonth = np.empty(numMonths, dtype=np.int64)
+        self._lastBusinessIndexInMonth = np.empty(numMonths, dtype=np.int64)
+        self._refreshMonthTables(0, numMonths)
+
+    def _refreshMonthTables(self, start, stop):
+        """Recompute the first and last business-day tables for months start to stop (exclusive)"""
+        monthStart, monthEnd = self._monthStartIndex[start:stop], self._monthStartIndex[start + 1:stop + 1] - 1
+        self._firstBusinessIndexInMonth[start:stop] = np.where(monthStart >= 0, self._nextBusinessIndex[np.maximum(monthStart, 0)], -1)
+        self._lastBusinessIndexInMonth[start:stop] = np.where(monthEnd < self._numDays,
+                                                              self._previousBusinessIndex[np.minimum(monthEnd, self._numDays - 1)], self._numDays)
+
+    def _monthNumber(self, givenDate):
+        """Return the position of a date's month in the month tables"""
+        startRange = self.validDateRange[0]
+        return (givenDate.year - startRange.year) * 12 + givenDate.month - startRange.month
+
+    def _monthNumberArray(self, index):
+        """Return the position of each index's month in the month tables"""
+        return (self._monthArray(index) - self._firstMonth).astype(np.int64)
+
+    def _checkMonthIndex(self, index):
+        """Raise a ValueError for a month table entry that runs past the valid date range"""
+        if index < 0:
+            self._raiseOutOfRange(self.validDateRange[0] - timedelta(days=1))
+        if index >= self._numDays:
+            self._raiseOutOfRange(self.validDateRange[1] + timedelta(days=1))
+        return int(index)
+
+    def _refreshRollTables(self, start, stop):
+        """Recompute the next and previous business-day tables for indices start to stop (exclusive)"""
+        count = self._businessDayCount
+        positions = np.append(self._businessDayPositions, self._numDays)
+        self._nextBusinessIndex[start:stop] = positions[count[start:stop]]
+        self._previousBusinessIndex[start:stop] = np.where(count[start + 1:stop + 1] > 0, positions[count[start + 1:stop + 1] - 1], -1)
+
+    def _followingIndex(self, index):
+        """Return the index of the first business day on or after an index (which may be one past the range)"""
+        following = int(self._nextBusinessIndex[index])
+        if following == self._numDays:
+            self._raiseOutOfRange(self.validDateRange[1] + timedelta(days=1))
+        return following
+
+    def _precedingIndex(self, index):
+        """Return the index of the last business day on or before an index (which may be one before the range)"""
+        preceding = int(self._previousBusinessIndex[index])
+        if preceding < 0:
+            self._raiseOutOfRange(self.validDateRange[0] - timedelta(days=1))
+        return preceding
+
+    def _monthOf(self, index):
+        """Return the calendar month of an index as (year, month)"""
+        day = date.fromordinal(self._firstOrdinal + index)
+        return day.year, day.month
+
+    def _countryMasks(self, code, sourceKeys):
+        """Return the cached read-only weekend and business-day masks of a single country"""
+        key = (code, self._firstOrdinal, self._numDays, sourceKeys)
+        entry = self._countryMaskCache.pop(key, None)
+        if entry is not None:
+            # Re-inserting the entry marks it as the most recently used
+            self._countryMaskCache[key] = entry
+            return entry
+        if currentMetrics(self) is not None:
+            currentMetrics(self).recordMiss("Calendar._countryMasks")
+
+        weekendMask = self._weekendMaskArray(self.weekendHistory[code], self._firstOrdinal, self._numDays)
+        if self.holidaySource is not None:
+            # Every year of this calendar's range is generated when the calendar is built (and memoized by the
+            # source); maxValidDateRangeYears bounds the cost
+            startRange, endRange = self.validDateRange
+            holidayIndex = np.array([holiday.toordinal() for holiday, _ in self.holidaySource.holidaysBetween(code, startRange, endRange)],
+                                    dtype=np.int64) - self._firstOrdinal
+            businessDayMask = ~weekendMask
+            businessDayMask[holidayIndex] = False
+        elif self.compiledPath is None:
+            source = self._loadSource(self.holidayPath, self._parseHolidayFile)
+            holidayIndex = source["ordinals"][code] - self._firstOrdinal
+            holidayIndex = holidayIndex[(holidayIndex >= 0) & (holidayIndex < self._numDays)]
+            businessDayMask = ~weekendMask
+            businessDayMask[holidayIndex] = False
+        else:
+            compiled = self._loadSource(self.compiledPath, self._parseCompiledFile)
+            businessDayMask = np.unpackbits(compiled["bitmaps"][compiled["countries"][code]], count=self._numDays).astype(bool)
+
+        weekendMask.flags.writeable = False
+        businessDayMask.flags.writeable = False
+        self._countryMaskCache[key] = (weekendMask, businessDayMask)
+        # Evict the least recently used masks, including those of stale sources
+        while len(self._countryMaskCache) > self.countryMaskCacheSize:
+            self._countryMaskCache.pop(next(iter(self._countryMaskCache)), None)
+        return weekendMask, businessDayMask
+
+    @staticmethod
+    def _weekendMaskArray(history, firstOrdinal, numDays):
+        """Expand a country's weekend masks by effective date into a weekend flag per day"""
+        effective, masks = history
+        ordinals = np.arange(firstOrdinal, firstOrdinal + numDays)
+        # Days before the first effective date use the earliest known weekend
+        bits = masks[np.maximum(np.searchsorted(effective, ordinals, side="right") - 1, 0)]
+        # date.fromordinal(1) is a Monday, so (ordinal - 1) % 7 is the weekday
+        return ((bits >> ((ordinals - 1) % 7)) & 1).astype(bool)
+
+    def _dayIndex(self, givenDate):
+        """Return the position of a date in the business-day index, validating the date range"""
+        index = givenDate.toordinal() - self._firstOrdinal
+        if not 0 <= index < self._numDays:
+            self._raiseOutOfRange(givenDate)
+        if self._missingWeekendCodes:
+            raise ValueError(f"Weekend information not available for country code: {self._missingWeekendCodes[0]}")
+        return index
+
+    def _dayIndexArray(self, dates):
+        """Return the positions of an array of dates in the business-day index, validating the date range in one pass"""
+        days = np.asarray(dates, dtype="datetime64[D]")
+        index = (days - self._firstDay).astype(np.int64)
+        outOfRange = (index < 0) | (index >= self._numDays)
+        if outOfRange.any():
+            startRange, endRange = self.validDateRange
+            raise ValueError(f"Date {days[outOfRange][0]} is out of the valid range: {startRange} to {endRange}")
+        if self._missingWeekendCodes:
+            raise ValueError(f"Weekend information not available for country code: {self._missingWeekendCodes[0]}")
+        return index
+
     def isWeekend(self, givenDate):
         """Check if a given date is a weekend"""
-        self.validateDateRange(givenDate)
-        for country in self.countryCodes:
-            if country in self.weekendTypes:
-                if givenDate.weekday() in self.weekendTypes[country]:
-                    return True
-            else:
-                raise ValueError(f"Weekend information not available for country code: {country}")
-        return False
-    
+        return bool(self._weekendMask[self._dayIndex(givenDate)])
+
     def isBusinessDay(self, givenDate):
         """Check if a given date is a business day"""
-        self.validateDateRange(givenDate)
-        if self.isWeekend(givenDate):
-            return False
-        for code in self.countryCodes:
-            if givenDate in self.holidayData['date'].values:
-                return False
-        return True   
+        return bool(self._businessDayMask[self._dayIndex(givenDate)])
+
+    def isWeekendArray(self, dates):
+        """Check which of an array of dates (datetime64[D], pandas Series or list of dates) are weekends"""
+        return self._weekendMask[self._dayIndexArray(dates)]
+
+    def isBusinessDayArray(self, dates):
+        """Check which of an array of dates (datetime64[D], pandas Series or list of dates) are business days"""
+        return self._businessDayMask[self._dayIndexArray(dates)]
+
+    def _holidayIndex(self):
+        """Return the holidays sorted by date as ordinal, date, name and country code arrays plus their holidayData rows"""
+        index = self.__dict__.get("_holidayIndexCache")
+        if index is None or index[0] != self.version:
+            if currentMetrics(self) is not None:
+                currentMetrics(self).recordMiss("Calendar._holidayIndex")
+            dates = self.holidayData["date"]
+            ordinals = np.fromiter((holiday.toordinal() for holiday in dates), dtype=np.int64, count=len(dates))
+            # A stable sort keeps holidays on the same date in holidayData order
+            rows = np.argsort(ordinals, kind="stable")
+            ordinals = ordinals[rows]
+            index = (self.version, ordinals, np.datetime64("0001-01-01") + (ordinals - 1).astype("timedelta64[D]"),
+                     self.holidayData["name"].to_numpy(dtype=object)[rows],
+                     self.holidayData["countryCode"].to_numpy(dtype=object)[rows], rows)
+            for array in index[1:]:
+                array.flags.writeable = False
+            # Snapshots build this lazily as well; concurrent builds produce equal arrays
+            object.__setattr__(self, "_holidayIndexCache", index)
+        return index
+
+    def _holidaySlice(self, startDate, endDate):
+        """Return the slice of the sorted holiday index between two dates, inclusive"""
+        endDate = self._checkDateRange(startDate, endDate)
+        index = self._holidayIndex()
+        start = np.searchsorted(index[1], startDate.toordinal(), side="left")
+        stop = np.searchsorted(index[1], endDate.toordinal(), side="right")
+        return index, slice(start, max(start, stop))
 
     def getHolidaysData(self, startDate, endDate=None):
         """Retrieve holidays between two dates"""
-        endDate = self.validateDateRange(startDate, endDate)
-        filteredHolidays = self.holidayData[
-            (self.holidayData["date"] >= startDate) &
-            (self.holidayData["date"] <= endDate)
-        ]
+        index, between = self._holidaySlice(startDate, endDate)
+        # Rows are returned in holidayData order, as a boolean filter would return them
+        filteredHolidays = self.holidayData.iloc[np.sort(index[5][between])]
         return filteredHolidays
 
+    def getHolidays(self, startDate, endDate=None, asArrays=False):
+        """Retrieve holidays between two dates as (date, name, countryCode) tuples sorted by date, or as arrays of each"""
+        index, between = self._holidaySlice(startDate, endDate)
+        if asArrays:
+            return index[2][between], index[3][between], index[4][between]
+        return tuple(zip(index[2][between].tolist(), index[3][between].tolist(), index[4][between].tolist()))
+
+    def addHoliday(self, givenDate, name, countryCode):
+        """Add a holiday for one of the calendar's countries, patching the business-day index in place"""
+        import pandas as pd
+        if self._frozen:
+            raise ValueError("Calendar snapshot is frozen: patch the live calendar (or use Calendar.patch) and take a new snapshot")
+        index, countryCode = self._dayIndex(givenDate), countryCode.upper()
+        self.validateCountryCode(self._countryBusinessDayMasks, None, [countryCode])
+
+        holiday = pd.DataFrame({"date": [givenDate], "name": [name], "countryCode": [countryCode]},
+                               index=[self.holidayData.index.max() + 1 if len(self.holidayData) else 0])
+        self.holidayData = pd.concat([self.holidayData, holiday])
+        self._setCountryBusinessDay(countryCode, index, False)
+
+    def removeHoliday(self, givenDate, countryCode):
+        """Remove the holidays of one of the calendar's countries on a date, patching the business-day index in place"""
+        if self._frozen:
+            raise ValueError("Calendar snapshot is frozen: patch the live calendar (or use Calendar.patch) and take a new snapshot")
+        index, countryCode = self._dayIndex(givenDate), countryCode.upper()
+        self.validateCountryCode(self._countryBusinessDayMasks, None, [countryCode])
+
+        matches = (self.holidayData["date"] == givenDate) & (self.holidayData["countryCode"] == countryCode)
+        if not matches.any():
+            raise ValueError(f"No holiday on {givenDate} for country code: {countryCode}")
+        self.holidayData = self.holidayData[~matches]
+        self._setCountryBusinessDay(countryCode, index, not self._countryWeekendMasks[countryCode][index])
+
+    def _setCountryBusinessDay(self, countryCode, index, isBusinessDay):
+        """Set whether a day is a business day in one country and update the joint mask, counts and positions"""
+        if not self._businessDayMask.flags.writeable:
+            # The arrays are shared with a snapshot, so copy them before patching
+            self._businessDayMask = self._businessDayMask.copy()
+            self._businessDayCount = self._businessDayCount.copy()
+            self._nextBusinessIndex = self._nextBusinessIndex.copy()
+            self._previousBusinessIndex = self._previousBusinessIndex.copy()
+            self._firstBusinessIndexInMonth = self._firstBusinessIndexInMonth.copy()
+            self._lastBusinessIndexInMonth = self._lastBusinessIndexInMonth.copy()
+        countryMask = self._countryBusinessDayMasks[countryCode]
+        if not countryMask.flags.writeable:
+            countryMask = self._countryBusinessDayMasks[countryCode] = countryMask.copy()
+        countryMask[index] = isBusinessDay
+
+        days = [mask[index] for mask in self._countryBusinessDayMasks.values()]
+        jointBusinessDay = all(days) if self.join == "any-closed" else any(days)
+        if jointBusinessDay != self._businessDayMask[index]:
+            # Only days between the neighbouring business days can change their next/previous business day
+            start = self._previousBusinessIndex[index - 1] + 1 if index > 0 else 0
+            stop = self._nextBusinessIndex[index + 1]
+            self._businessDayMask[index] = jointBusinessDay
+            # Only the counts after the changed day move, by one
+            self._businessDayCount[index + 1:] += 1 if jointBusinessDay else -1
+            position = self._businessDayCount[index]
+            if jointBusinessDay:
+                self._businessDayPositions = np.insert(self._businessDayPositions, position, index)
+            else:
+                self._businessDayPositions = np.delete(self._businessDayPositions, position)
+            self._refreshRollTables(start, stop)
+            # Months whose first or last day had their next/previous business day refreshed
+            months = np.searchsorted(self._monthStartIndex, [start, stop], side="right")
+            self._refreshMonthTables(max(months[0] - 2, 0), min(months[1], len(self._firstBusinessIndexInMonth)))
+        self.version += 1
+
     def addBusinessDays(self, startDate, numBusinessDays, startDateRoll=None):
         """Add a specified number of business days to a start date"""
-        self.validateDateRange(startDate)
+        self._checkDateRange(startDate)
     
         # Validate startDateRoll
         validRolls = {"f", "p", "mf", "mp", None}
         if startDateRoll is not None and startDateRoll.lower() not in validRolls:
             raise ValueError(f"Invalid roll type: '{startDateRoll}'. Expected 'f', 'p', 'mf', 'mp', or None.")
     
-        # Adjust startDate according to startDateRoll if startDateRoll is specified
+        # Adjust startDate according to startDateRoll if startDateRoll is specified. mf/mp compare the
+        # month of the business day after/before startDate, not of the rolled date
         if startDateRoll is not None:
             roll = startDateRoll.lower()
+            index = rolled = self._dayIndex(startDate)
             if roll == "f":
-                while not self.isBusinessDay(startDate):
-                    startDate += timedelta(days=1)
+                rolled = self._followingIndex(index)
             elif roll == "p":
-                while not self.isBusinessDay(startDate):
-                    startDate -= timedelta(days=1)
+                rolled = self._precedingIndex(index)
             elif roll == "mf":
-                nextBusinessDay = startDate + timedelta(days=1)
-                while not self.isBusinessDay(nextBusinessDay):
-                    nextBusinessDay += timedelta(days=1)
-                if nextBusinessDay.month != startDate.month:
-                    while not self.isBusinessDay(startDate):
-                        startDate -= timedelta(days=1)
+                if self._monthOf(self._followingIndex(index + 1)) != self._monthOf(index):
+                    rolled = self._precedingIndex(index)
             elif roll == "mp":
-                previousBusinessDay = startDate - timedelta(days=1)
-                while not self.isBusinessDay(previousBusinessDay):
-                    previousBusinessDay -= timedelta(days=1)
-                if previousBusinessDay.month != startDate.month:
-                    while not self.isBusinessDay(startDate):
-                        startDate += timedelta(days=1)
+                if self._monthOf(self._precedingIndex(index - 1)) != self._monthOf(index):
+                    rolled = self._followingIndex(index)
+            startDate += timedelta(days=rolled - index)
     
-        # If numBusinessDays is 0 and startDateRoll is None, return startDate
-        if numBusinessDays == 0 and startDateRoll is None:
+        # If numBusinessDays is 0, return the (rolled) startDate
+        if numBusinessDays == 0:
             return startDate
-    
-        # Initialize currentDate based on adjusted startDate
-        currentDate = startDate
-        businessDaysAdded = 0
-    
-        # Add or subtract days until the required number of business days are added/subtracted
+
+        # Look up the target in the list of business-day positions using the cumulative counts
+        index = self._dayIndex(startDate)
         if numBusinessDays > 0:
-            while businessDaysAdded < numBusinessDays:
-                currentDate += timedelta(days=1)
-                if self.isBusinessDay(currentDate):
-                    businessDaysAdded += 1
-        elif numBusinessDays < 0:
-            while businessDaysAdded > numBusinessDays:
-                currentDate -= timedelta(days=1)
-                if self.isBusinessDay(currentDate):
-                    businessDaysAdded -= 1
-    
-        return currentDate
+            position = self._businessDayCount[index + 1] + numBusinessDays - 1
+        else:
+            position = self._businessDayCount[index] + numBusinessDays
+        if position < 0:
+            self._raiseOutOfRange(self.validDateRange[0] - timedelta(days=1))
+        if position >= len(self._businessDayPositions):
+            self._raiseOutOfRange(self.validDateRange[1] + timedelta(days=1))
+
+        return startDate + timedelta(days=int(self._businessDayPositions[position]) - index)
+
+    def _raiseOutOfRangeArray(self, index, invalid):
+        """Raise a ValueError for the first index whose business-day lookup runs past the valid date range"""
+        startRange, endRange = self.validDateRange
+        raise ValueError(f"Business day lookup from {self._firstDay + index[invalid][0]} runs past the valid range: {startRange} to {endRange}")
+
+    def _followingIndexArray(self, index):
+        """Return the index of the first business day on or after each index (index may be one past the range)"""
+        following = self._nextBusinessIndex[index]
+        invalid = following == self._numDays
+        if invalid.any():
+            self._raiseOutOfRangeArray(index, invalid)
+        return following
+
+    def _precedingIndexArray(self, index):
+        """Return the index of the last business day on or before each index (index may be one before the range)"""
+        preceding = self._previousBusinessIndex[index]
+        invalid = preceding < 0
+        if invalid.any():
+            self._raiseOutOfRangeArray(index, invalid)
+        return preceding
+
+    def _monthArray(self, index):
+        """Return the calendar month of each index as datetime64[M]"""
+        return (self._firstDay + index).astype("datetime64[M]")
+
+    def _rollIndexArray(self, index, roll):
+        """Adjust an array of indices with the same f/p/mf/mp start-date roll as addBusinessDays"""
+        if roll == "f":
+            return self._followingIndexArray(index)
+        if roll == "p":
+            return self._precedingIndexArray(index)
+        if roll == "mf":
+            nextBusinessDay = self._followingIndexArray(index + 1)
+            monthChanged = self._monthArray(nextBusinessDay) != self._monthArray(index)
+            rolled = index.copy()
+            rolled[monthChanged] = self._precedingIndexArray(index[monthChanged])
+            return rolled
+        if roll == "mp":
+            previousBusinessDay = self._precedingIndexArray(index - 1)
+            monthChanged = self._monthArray(previousBusinessDay) != self._monthArray(index)
+            rolled = index.copy()
+            rolled[monthChanged] = self._followingIndexArray(index[monthChanged])
+            return rolled
+        return index
+
+    def addBusinessDaysArray(self, startDates, numBusinessDays, startDateRoll=None):
+        """Add business days (a scalar or per-row array) to an array of start dates, returning a datetime64[D] array"""
+        index = self._dayIndexArray(startDates)
+
+        # Validate startDateRoll
+        validRolls = {"f", "p", "mf", "mp", None}
+        if startDateRoll is not None and startDateRoll.lower() not in validRolls:
+            raise ValueError(f"Invalid roll type: '{startDateRoll}'. Expected 'f', 'p', 'mf', 'mp', or None.")
+        if startDateRoll is not None:
+            index = self._rollIndexArray(index, startDateRoll.lower())
+
+        index, offsets = np.broadcast_arrays(index, np.asarray(numBusinessDays, dtype=np.int64))
+        position = np.where(offsets > 0,
+                            self._businessDayCount[index + 1] + offsets - 1,
+                            self._businessDayCount[index] + offsets)
+        invalid = (offsets != 0) & ((position < 0) | (position >= len(self._businessDayPositions)))
+        if invalid.any():
+            self._raiseOutOfRangeArray(index, invalid)
+
+        # Offsets of zero return the (rolled) start date
+        result = np.where(offsets == 0, index, self._businessDayPositions[np.where(offsets == 0, 0, position)])
+        return self._firstDay + result
 
 
  
     def getLastBusinessDateInMonth(self, givenDate):
         """Find the last business day in a given month"""
-        self.validateDateRange(givenDate)
-        
-        # Manually calculate the last date of the month
-        if givenDate.month == 12:
-            lastDate = date(givenDate.year + 1, 1, 1) - timedelta(days=1)
-        else:
-            lastDate = date(givenDate.year, givenDate.month + 1, 1) - timedelta(days=1)
-        
-        # Iterate backwards to find the last business day
-        while not self.isBusinessDay(lastDate):
-            lastDate -= timedelta(days=1)
-    
-        return lastDate
+        self._dayIndex(givenDate)
+        lastIndex = self._checkMonthIndex(self._lastBusinessIndexInMonth[self._monthNumber(givenDate)])
+        return date.fromordinal(self._firstOrdinal + lastIndex)
+
+    def getFirstBusinessDateInMonth(self, givenDate):
+        """Find the first business day in a given month"""
+        self._dayIndex(givenDate)
+        firstIndex = self._checkMonthIndex(self._firstBusinessIndexInMonth[self._monthNumber(givenDate)])
+        return date.fromordinal(self._firstOrdinal + firstIndex)
+
+    def getNthBusinessDateInMonth(self, givenDate, n):
+        """Find the nth business day in a given month, counting from the month end when n is negative (-1 is the last)"""
+        self._dayIndex(givenDate)
+        month = self._monthNumber(givenDate)
+        position = self._nthBusinessPositionArray(np.array([month]), np.array([n]))[0]
+        return date.fromordinal(self._firstOrdinal + int(self._businessDayPositions[position]))
 
-    
     def isLastBusinessDayInMonth(self, givenDate):
         """Check if a given date is the last business day of the month"""
-        self.validateDateRange(givenDate)
+        self._checkDateRange(givenDate)
         return self.getLastBusinessDateInMonth(givenDate) == givenDate
 
-    def addTenor(self, startDate, tenor, roll, preserveMonthEnd):
-        """Add a specified tenor to the start date"""
-        tenor = tenor.lower()
-        if not isinstance(startDate, date):
-            raise ValueError("The 'startDate' must be a datetime.date object.")
+    def _monthTableArray(self, table, dates):
+        """Look up a month table for an array of dates, returning a datetime64[D] array"""
+        result = table[self._monthNumberArray(self._dayIndexArray(dates))]
+        invalid = (result < 0) | (result >= self._numDays)
+        if invalid.any():
+            self._checkMonthIndex(result[invalid][0])
+        return self._firstDay + result
+
+    def getFirstBusinessDateInMonthArray(self, dates):
+        """Find the first business day in the month of each of an array of dates, returning a datetime64[D] array"""
+        return self._monthTableArray(self._firstBusinessIndexInMonth, dates)
+
+    def getLastBusinessDateInMonthArray(self, dates):
+        """Find the last business day in the month of each of an array of dates, returning a datetime64[D] array"""
+        return self._monthTableArray(self._lastBusinessIndexInMonth, dates)
+
+    def isLastBusinessDayInMonthArray(self, dates):
+        """Check which of an array of dates are the last business day of their month"""
+        index = self._dayIndexArray(dates)
+        return self._lastBusinessIndexInMonth[self._monthNumberArray(index)] == index
+
+    def _nthBusinessPositionArray(self, months, n):
+        """Return the positions in _businessDayPositions of the nth business day of each month"""
+        n = np.asarray(n)
+        if not np.issubdtype(n.dtype, np.integer):
+            raise ValueError("n must be an integer")
+        monthStart, monthEnd = self._monthStartIndex[months], self._monthStartIndex[months + 1] - 1
+        self._checkIndexArray(np.concatenate([monthStart.ravel(), monthEnd.ravel()]))
+        before, through = self._businessDayCount[monthStart], self._businessDayCount[monthEnd + 1]
+        invalid = (n == 0) | (np.abs(n) > through - before)
+        if invalid.any():
+            month = (self._firstMonth + months[invalid][0])
+            raise ValueError(f"Invalid n: {np.broadcast_to(n, months.shape)[invalid][0]}. {month} has {(through - before)[invalid][0]} business days.")
+        return np.where(n > 0, before + n - 1, through + n)
+
+    def getNthBusinessDateInMonthArray(self, dates, n):
+        """Find the nth business day (or per-row array of n) in the month of each of an array of dates, returning a datetime64[D] array"""
+        months = self._monthNumberArray(self._dayIndexArray(dates))
+        months, n = np.broadcast_arrays(months, np.asarray(n))
+        return self._firstDay + self._businessDayPositions[self._nthBusinessPositionArray(months, n)]
+
+    @staticmethod
+    def _validateTenorArguments(roll, preserveMonthEnd):
+        """Validate the roll and preserveMonthEnd arguments of addTenor, returning them normalised"""
         validRolls = {"f", "p", "mf", "mp"}
         roll = roll.lower()
         if roll not in validRolls:
@@ -201,57 +1009,267 @@ class Calendar:
             preserveMonthEnd = preserveMonthEnd.strip().lower() == "true"
         elif not isinstance(preserveMonthEnd, bool):
             raise ValueError("The 'preserveMonthEnd' parameter must be 'True' or 'False'.")
+        return roll, preserveMonthEnd
+
+    @staticmethod
+    def _parseTenor(tenor):
+        """Split a tenor such as '3M' or '-2w' into its unit and amount"""
+        tenor = tenor.lower()
         unit = tenor[-1]
         amount = int(tenor[:-1])
+        if unit not in ("d", "w", "m", "y"):
+            raise ValueError(f"Invalid tenor unit: '{unit}'. Expected 'd', 'w', 'm', or 'y'.")
+        return unit, amount
+
+    @staticmethod
+    def _addMonths(givenDate, months):
+        """Add months to a date, clamping the day to the end of the month like relativedelta"""
+        year, month = divmod(givenDate.year * 12 + givenDate.month - 1 + months, 12)
+        nextMonth = date(year + 1, 1, 1) if month == 11 else date(year, month + 2, 1)
+        lastDay = (nextMonth - timedelta(days=1)).day
+        return givenDate.replace(year=year, month=month + 1, day=min(givenDate.day, lastDay))
+
+    def addTenor(self, startDate, tenor, roll, preserveMonthEnd):
+        """Add a specified tenor to the start date"""
+        if not isinstance(startDate, date):
+            raise ValueError("The 'startDate' must be a datetime.date object.")
+        roll, preserveMonthEnd = self._validateTenorArguments(roll, preserveMonthEnd)
+        unit, amount = self._parseTenor(tenor)
         if unit == "d":
             rawEndDate = startDate + timedelta(days=amount)
         elif unit == "w":
             rawEndDate = startDate + timedelta(weeks=amount)
         elif unit == "m":
-            rawEndDate = startDate + relativedelta(months=amount)
-        elif unit == "y":
-            rawEndDate = startDate + relativedelta(years=amount)
+            rawEndDate = self._addMonths(startDate, amount)
         else:
-            raise ValueError(f"Invalid tenor unit: '{unit}'. Expected 'd', 'w', 'm', or 'y'.")
+            rawEndDate = self._addMonths(startDate, 12 * amount)
         if preserveMonthEnd and (unit in ("m", "y")) and self.isLastBusinessDayInMonth(startDate):
             rawEndDate = self.getLastBusinessDateInMonth(rawEndDate)
-        if self.isBusinessDay(rawEndDate):
-            finalEndDate = rawEndDate
-        else:
+        rawIndex = adjusted = self._dayIndex(rawEndDate)
+        if not self._businessDayMask[rawIndex]:
             if roll == "f":
-                finalEndDate = self.addBusinessDays(rawEndDate, 1)
+                adjusted = self._followingIndex(rawIndex)
             elif roll == "p":
-                while not self.isBusinessDay(rawEndDate):
-                    rawEndDate -= timedelta(days=1)
-                finalEndDate = rawEndDate
+                adjusted = self._precedingIndex(rawIndex)
             elif roll == "mf":
-                finalEndDate = self.addBusinessDays(rawEndDate, 1)
-                if finalEndDate.month != rawEndDate.month:
-                    finalEndDate -= timedelta(days=1)
-                    while not self.isBusinessDay(finalEndDate):
-                        finalEndDate -= timedelta(days=1)
+                adjusted = self._followingIndex(rawIndex)
+                if self._monthOf(adjusted) != self._monthOf(rawIndex):
+                    adjusted = self._precedingIndex(adjusted - 1)
             elif roll == "mp":
-                finalEndDate = rawEndDate
-                while not self.isBusinessDay(rawEndDate):
-                    finalEndDate = rawEndDate
-                    rawEndDate -= timedelta(days=1)
-                if finalEndDate.month != rawEndDate.month:
-                    finalEndDate = self.addBusinessDays(finalEndDate + timedelta(days=1), 1)
-        self.validateDateRange(finalEndDate)
+                # Step to the day after the preceding business day, and if that crosses a month boundary
+                # take the business day after the day following it
+                adjusted = self._precedingIndex(rawIndex) + 1
+                if self._monthOf(adjusted) != self._monthOf(adjusted - 1):
+                    if adjusted + 1 >= self._numDays:
+                        self._raiseOutOfRange(rawEndDate + timedelta(days=adjusted + 1 - rawIndex))
+                    adjusted = self._followingIndex(adjusted + 2)
+        finalEndDate = rawEndDate + timedelta(days=adjusted - rawIndex)
+        self._checkDateRange(finalEndDate)
         return finalEndDate
 
-    def numBusinessDaysBetween(self, startDate, endDate):
+    def _checkIndexArray(self, index):
+        """Raise a ValueError if any index falls outside the valid date range"""
+        invalid = (index < 0) | (index >= self._numDays)
+        if invalid.any():
+            startRange, endRange = self.validDateRange
+            raise ValueError(f"Date {self._firstDay + index[invalid][0]} is out of the valid range: {startRange} to {endRange}")
+
+    def _lastBusinessIndexArray(self, index):
+        """Return the index of the last business day in the month of each index"""
+        lastIndex = self._lastBusinessIndexInMonth[self._monthNumberArray(index)]
+        invalid = (lastIndex < 0) | (lastIndex >= self._numDays)
+        if invalid.any():
+            self._checkMonthIndex(lastIndex[invalid][0])
+        return lastIndex
+
+    @staticmethod
+    def _addMonthsArray(days, months):
+        """Add months to datetime64[D] days, clamping to the end of the month like relativedelta"""
+        startMonth = days.astype("datetime64[M]")
+        dayOfMonth = (days - startMonth.astype("datetime64[D]")).astype(np.int64)
+        endMonth = startMonth + months
+        monthStart = endMonth.astype("datetime64[D]")
+        monthLength = ((endMonth + 1).astype("datetime64[D]") - monthStart).astype(np.int64)
+        return monthStart + np.minimum(dayOfMonth, monthLength - 1)
+
+    def addTenorArray(self, startDates, tenors, roll, preserveMonthEnd):
+        """Add a tenor (or per-row array of tenors) to an array of start dates, returning a datetime64[D] array"""
+        roll, preserveMonthEnd = self._validateTenorArguments(roll, preserveMonthEnd)
+        days, tenors = np.broadcast_arrays(np.asarray(startDates, dtype="datetime64[D]"), np.asarray(tenors, dtype=str))
+
+        # Parse each distinct tenor once into a month and day offset
+        uniqueTenors, tenorIndex = np.unique(tenors, return_inverse=True)
+        tenorMonths = np.zeros(len(uniqueTenors), dtype=np.int64)
+        tenorDays = np.zeros(len(uniqueTenors), dtype=np.int64)
+        tenorIsMonthly = np.zeros(len(uniqueTenors), dtype=bool)
+        for i, tenor in enumerate(uniqueTenors):
+            unit, amount = self._parseTenor(tenor)
+            tenorIsMonthly[i] = unit in ("m", "y")
+            if unit == "d":
+                tenorDays[i] = amount
+            elif unit == "w":
+                tenorDays[i] = 7 * amount
+            elif unit == "m":
+                tenorMonths[i] = amount
+            else:
+                tenorMonths[i] = 12 * amount
+        tenorIndex = tenorIndex.reshape(days.shape)
+        rawEnd = (self._addMonthsArray(days, tenorMonths[tenorIndex]) - self._firstDay).astype(np.int64) + tenorDays[tenorIndex]
+
+        if preserveMonthEnd:
+            isMonthly = tenorIsMonthly[tenorIndex]
+            if isMonthly.any():
+                start = self._dayIndexArray(days[isMonthly])
+                atMonthEnd = np.zeros(days.shape, dtype=bool)
+                atMonthEnd[isMonthly] = self._lastBusinessIndexArray(start) == start
+                self._checkIndexArray(rawEnd[atMonthEnd])
+                rawEnd[atMonthEnd] = self._lastBusinessIndexArray(rawEnd[atMonthEnd])
+
+        return self._firstDay + self._rollTenorIndexArray(rawEnd, roll)
+
+    def _rollTenorIndexArray(self, rawEnd, roll):
+        """Adjust raw tenor end indices that are not business days with the same f/p/mf/mp logic as addTenor"""
+        self._checkIndexArray(rawEnd)
+        finalEnd = rawEnd.copy()
+        toRoll = ~self._businessDayMask[rawEnd]
+        raw = rawEnd[toRoll]
+        if roll == "f":
+            adjusted = self._followingIndexArray(raw)
+        elif roll == "p":
+            adjusted = self._precedingIndexArray(raw)
+        elif roll == "mf":
+            adjusted = self._followingIndexArray(raw)
+            monthChanged = self._monthArray(adjusted) != self._monthArray(raw)
+            adjusted[monthChanged] = self._precedingIndexArray(adjusted[monthChanged] - 1)
+        else:
+            # Same as the scalar mp loop: step to the day after the preceding business day, and if that
+            # crosses a month boundary take the business day after the day following it
+            adjusted = self._precedingIndexArray(raw) + 1
+            monthChanged = self._monthArray(adjusted) != self._monthArray(adjusted - 1)
+            self._checkIndexArray(adjusted[monthChanged] + 1)
+            adjusted[monthChanged] = self._followingIndexArray(adjusted[monthChanged] + 2)
+        finalEnd[toRoll] = adjusted
+        return finalEnd
+
+    def generateSchedule(self, startDate, endDate, frequency, roll, preserveMonthEnd, stub="front", longStub=False):
+        """Generate the unadjusted and adjusted dates of a schedule as two datetime64[D] arrays
+
+        stub="front" generates backwards from endDate, leaving any stub period at the front; stub="back"
+        generates forwards from startDate, leaving it at the back. longStub merges the stub with the
+        neighbouring regular period. Every regular date equals addTenor(anchor, k * frequency, roll,
+        preserveMonthEnd), where the anchor is endDate for a front stub and startDate for a back stub.
+        """
+        unadjusted, adjusted, offsets = self.generateSchedules(
+            [startDate], [endDate], frequency, roll, preserveMonthEnd, stub, longStub)
+        return unadjusted, adjusted
+
+    def generateSchedules(self, startDates, endDates, frequency, roll, preserveMonthEnd, stub="front", longStub=False):
+        """Generate the schedules of many trades at once, with the same conventions as generateSchedule
+
+        Returns flat datetime64[D] arrays of unadjusted and adjusted dates together with an offsets array,
+        so that the dates of schedule i are unadjusted[offsets[i]:offsets[i + 1]].
+        """
+        roll, preserveMonthEnd = self._validateTenorArguments(roll, preserveMonthEnd)
+        if stub not in ("front", "back"):
+            raise ValueError(f"Invalid stub type: '{stub}'. Expected 'front' or 'back'.")
+        unit, amount = self._parseTenor(frequency)
+        if amount <= 0:
+            raise ValueError(f"The frequency must be a positive tenor, got '{frequency}'.")
+        isMonthly = unit in ("m", "y")
+        stepMonths = amount * (12 if unit == "y" else 1) if isMonthly else 0
+        stepDays = 0 if isMonthly else amount * (7 if unit == "w" else 1)
+
+        startIndex, endIndex = np.broadcast_arrays(self._dayIndexArray(startDates).ravel(),
+                                                   self._dayIndexArray(endDates).ravel())
+        if (startIndex >= endIndex).any():
+            raise ValueError("Start date must be before end date")
+        forward = stub == "back"
+        anchor, opposite, sign = (startIndex, endIndex, 1) if forward else (endIndex, startIndex, -1)
+
+        # Enough candidate dates per schedule to reach one step past the opposite end
+        if isMonthly:
+            monthSpan = (self._monthArray(endIndex) - self._monthArray(startIndex)).astype(np.int64)
+            numCandidates = monthSpan // stepMonths + 2
+        else:
+            numCandidates = (endIndex - startIndex) // stepDays + 2
+        candidateOffsets = np.cumsum(numCandidates) - numCandidates
+        trade = np.repeat(np.arange(len(anchor)), numCandidates)
+        step = np.arange(len(trade)) - candidateOffsets[trade]
+        grid = (self._addMonthsArray(self._firstDay + anchor[trade], sign * step * stepMonths)
+                - self._firstDay).astype(np.int64) + sign * step * stepDays
+
+        # Regular dates strictly inside the schedule; the first candidate outside decides whether there is a stub
+        inside = grid < endIndex[trade] if forward else grid > startIndex[trade]
+        numRegular = np.bincount(trade, weights=inside, minlength=len(anchor)).astype(np.int64)
+        hasStub = grid[candidateOffsets + numRegular] != opposite
+        if longStub:
+            numRegular -= hasStub & (numRegular >= 2)
+        keep = step < numRegular[trade]
+        grid, trade, step = grid[keep], trade[keep], step[keep]
+
+        # Adjust the regular dates like addTenor, and roll the opposite end on its own
+        adjustedGrid = grid
+        if preserveMonthEnd and isMonthly:
+            atMonthEnd = (self._lastBusinessIndexArray(anchor) == anchor)[trade]
+            adjustedGrid = grid.copy()
+            adjustedGrid[atMonthEnd] = self._lastBusinessIndexArray(grid[atMonthEnd])
+        adjustedGrid = self._rollTenorIndexArray(adjustedGrid, roll)
+        adjustedOpposite = self._rollTenorIndexArray(opposite, roll)
+
+        # Lay the schedules out in date order, one after another
+        counts = numRegular + 1
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        if forward:
+            gridSlot = offsets[trade] + step
+            oppositeSlot = offsets[1:] - 1
+        else:
+            gridSlot = offsets[trade] + counts[trade] - 1 - step
+            oppositeSlot = offsets[:-1]
+        unadjusted = np.empty(offsets[-1], dtype=np.int64)
+        adjusted = np.empty(offsets[-1], dtype=np.int64)
+        unadjusted[gridSlot], adjusted[gridSlot] = grid, adjustedGrid
+        unadjusted[oppositeSlot], adjusted[oppositeSlot] = opposite, adjustedOpposite
+        return self._firstDay + unadjusted, self._firstDay + adjusted, offsets
+
+    @classmethod
+    def _validateInclusive(cls, inclusive):
+        """Validate the inclusive argument of numBusinessDaysBetween, returning the offsets of the start and end counts"""
+        if inclusive not in cls.validInclusive:
+            raise ValueError(f"Invalid inclusive: '{inclusive}'. Expected 'both', 'left', 'right' or 'neither'.")
+        return int(inclusive in ("right", "neither")), int(inclusive in ("both", "right"))
+
+    def numBusinessDaysBetween(self, startDate, endDate, inclusive="both"):
         """Calculate the number of business days between two dates"""
-        endDate = self.validateDateRange(startDate, endDate)
-        currentDate = startDate
-        businessDaysCount = 0
-        
-        while currentDate <= endDate:
-            if self.isBusinessDay(currentDate):
-                businessDaysCount += 1
-            currentDate += timedelta(days=1)
-        
-        return businessDaysCount
-    
-    
-    
\ No newline at end of file
+        startOffset, endOffset = self._validateInclusive(inclusive)
+        endDate = self._checkDateRange(startDate, endDate)
+        startIndex = self._dayIndex(startDate)
+        endIndex = self._dayIndex(endDate)
+        return max(int(self._businessDayCount[endIndex + endOffset] - self._businessDayCount[startIndex + startOffset]), 0)
+
+    def numBusinessDaysBetweenArray(self, startDates, endDates=None, inclusive="both"):
+        """Calculate the number of business days between arrays of start and end dates, returning an int64 array"""
+        startOffset, endOffset = self._validateInclusive(inclusive)
+        startIndex = self._dayIndexArray(startDates)
+        endIndex = np.int64(self._numDays - 1) if endDates is None else self._dayIndexArray(endDates)
+        startIndex, endIndex = np.broadcast_arrays(startIndex, endIndex)
+        if (startIndex > endIndex).any():
+            raise ValueError("Start date must be before end date")
+        # Excluding the start of a one-day period would count -1 for a business day, so counts are floored at 0
+        return np.maximum(self._businessDayCount[endIndex + endOffset] - self._businessDayCount[startIndex + startOffset], 0)
+
+
+# Methods measured while metrics are enabled. Rolls and business-day steps are table lookups rather than
+# loops, so no loop iterations are recorded for them
+instrument(Calendar, {
+    "__init__": None, "get": "cache", "_loadSource": "cache", "_countryMasks": "cache", "_holidayIndex": "cache",
+    "loadHoliday": None, "loadWeekend": None, "loadWeekendHistory": None, "loadCompiled": None,
+    "validateDateRange": None, "_checkDateRange": None, "_dayIndexArray": None,
+    "isWeekend": None, "isBusinessDay": None, "isWeekendArray": None, "isBusinessDayArray": None,
+    "getHolidaysData": None, "getHolidays": None, "addHoliday": None, "removeHoliday": None,
+    "addBusinessDays": None, "addBusinessDaysArray": None,
+    "_followingIndex": None, "_precedingIndex": None, "_followingIndexArray": None, "_precedingIndexArray": None,
+    "getFirstBusinessDateInMonth": None, "getLastBusinessDateInMonth": None, "getNthBusinessDateInMonth": None,
+    "isLastBusinessDayInMonth": None, "addTenor": None, "addTenorArray": None,
+    "generateSchedule": None, "generateSchedules": None, "numBusinessDaysBetween": None,
+    "numBusinessDaysBetweenArray": None,
+})
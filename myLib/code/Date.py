@@ -36,7 +36,7 @@ class Date(date):  # Define Date class inheriting from datetime.date
 
     def daysInYear(self):  # Instance method to calculate days in the instantiated year
         """Calculate the number of days in the instantiated year using the isLeapYear method."""
-        return 366 if self.isLeapYear() else 365
+        return 366 if Date.isLeapYear(self) else 365  # Also works when called as Date.daysInYear(date)
 
 
 
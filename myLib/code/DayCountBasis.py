@@ -5,17 +5,58 @@ Created on Mon Jun 17 20:49:30 2024
 @author: ButlerMasango
 """
 from enum import Enum
-from datetime import date
-from Calendar import Calendar 
-from Date import Date
+from itertools import accumulate
+try:
+    from . import Validation
+    from .Metrics import instrument
+except ImportError:
+    import Validation
+    from Metrics import instrument
+
+_Calendar = None
+
+def _calendar():
+    """Import Calendar on first use so that importing DayCountBasis does not pull in NumPy"""
+    global _Calendar
+    if _Calendar is None:
+        try:
+            from .Calendar import Calendar
+        except ImportError:
+            from Calendar import Calendar
+        _Calendar = Calendar
+    return _Calendar
+
+# Year table over the years of datetime.date: _yearStartOrdinal[y] is the ordinal of 1 January of year y
+# (index 10000 is one past 31 December 9999), _daysInYear[y] the length of year y and _monthStartDay[leap][m]
+# the number of days of the year before month m, so that ACT/ACT needs no date objects per call
+_daysInYear = [0] + [366 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 365 for year in range(1, 10000)]
+_yearStartOrdinal = [0] + list(accumulate(_daysInYear[1:], initial=1))
+_monthStartDay = ((0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334),
+                  (0, 0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335))
+_yearTableArrays = None
+
+def _yearTables():
+    """Return the year table as NumPy arrays, built on first use"""
+    global _yearTableArrays
+    if _yearTableArrays is None:
+        import numpy as np
+        _yearTableArrays = (np.array(_yearStartOrdinal, dtype=np.int64), np.array(_daysInYear, dtype=np.int64),
+                            np.array(_monthStartDay, dtype=np.int64))
+        for array in _yearTableArrays:
+            array.flags.writeable = False
+    return _yearTableArrays
 
 class DayCountConvention(Enum):
     ACT_365 = 'act/365'
     ACT_360 = 'act/360'
-    ACT_ACT = 'act/act'
+    ACT_ACT = 'act/act'  # Same as ACT/ACT ISDA
+    ACT_ACT_ISDA = 'act/act isda'
+    ACT_ACT_ICMA = 'act/act icma'
+    ACT_ACT_AFB = 'act/act afb'
     THIRTY_360 = '30/360'
     THIRTY_360E = '30/360e'
     THIRTY_360EE = '30/360ee'
+    BUS_252 = 'bus/252'
     
     @classmethod
     def from_string(cls, basis_str):
@@ -26,13 +67,25 @@ class DayCountConvention(Enum):
         raise ValueError(f"Invalid basis: {basis_str}")
 
 class DayCountBasis:
-    def __init__(self, basis):
+    def __init__(self, basis, calendar=None):
         self.basis = DayCountConvention.from_string(basis)
+        # BUS/252 counts the business days of a Calendar (or of the shared calendar for a country code)
+        if isinstance(calendar, str):
+            calendar = _calendar().get(calendar)
+        if self.basis == DayCountConvention.BUS_252 and calendar is None:
+            raise ValueError("The bus/252 basis requires a calendar")
+        self.calendar = calendar
 
-    def dayCountFraction(self, start_date, end_date):
-        """Calculate day count fraction between start_date and end_date based on the specified basis"""
-        Calendar.validateDateRange(start_date)
-        Calendar.validateDateRange(end_date)
+    def dayCountFraction(self, start_date, end_date, reference_start=None, reference_end=None, frequency=None):
+        """Calculate day count fraction between start_date and end_date based on the specified basis
+
+        ACT/ACT ICMA also needs the reference (coupon) period containing the dates and the coupon frequency per year.
+        """
+        if not Validation.isTrusted():
+            # BUS/252 dates only need to lie in the range of its calendar, which may differ from the default
+            validate = self.calendar._checkDateRange if self.basis == DayCountConvention.BUS_252 else _calendar().validateDateRange
+            validate(start_date)
+            validate(end_date)
         
         if end_date < start_date:
             raise ValueError("endDate must be greater than or equal to startDate")
@@ -46,9 +99,15 @@ class DayCountBasis:
         elif self.basis == DayCountConvention.ACT_360:
             return (end_date - start_date).days / 360.0
         
-        elif self.basis == DayCountConvention.ACT_ACT:
+        elif self.basis in (DayCountConvention.ACT_ACT, DayCountConvention.ACT_ACT_ISDA):
             return self.actAct(start_date, end_date)
         
+        elif self.basis == DayCountConvention.ACT_ACT_ICMA:
+            return self.actActIcma(start_date, end_date, reference_start, reference_end, frequency)
+        
+        elif self.basis == DayCountConvention.ACT_ACT_AFB:
+            return self.actActAfb(start_date, end_date)
+        
         elif self.basis == DayCountConvention.THIRTY_360:
             return self.thirty360(start_date, end_date)
         
@@ -58,27 +117,77 @@ class DayCountBasis:
         elif self.basis == DayCountConvention.THIRTY_360EE:
             return self.thirty360ee(start_date, end_date)
         
+        elif self.basis == DayCountConvention.BUS_252:
+            return self.bus252(start_date, end_date)
+        
         else:
             raise ValueError("Unsupported basis input")
     
     
     @staticmethod
     def actAct(start_date, end_date):
-        """Calculate day count fraction using ACT/ACT basis"""
+        """Calculate day count fraction using ACT/ACT ISDA basis"""
         
-        end_date = Calendar.validateDateRange(start_date, end_date)
-        if start_date.year == end_date.year:
-            return (end_date - start_date).days / Date.daysInYear(start_date)
+        end_date = _calendar().validateDateRange(start_date, end_date)
+        startYear, endYear = start_date.year, end_date.year
+        start, end = start_date.toordinal(), end_date.toordinal()
+        if startYear == endYear:
+            return (end - start) / _daysInYear[startYear]
         else:
-            fractionFirstYear = ((date(start_date.year, 12, 31) - start_date).days + 1) / Date.daysInYear(start_date)
-            fractionLastYear = (end_date - date(end_date.year, 1, 1)).days / Date.daysInYear(end_date)
-            yearsBetween = (end_date.year - start_date.year - 1)
+            fractionFirstYear = (_yearStartOrdinal[startYear + 1] - start) / _daysInYear[startYear]
+            fractionLastYear = (end - _yearStartOrdinal[endYear]) / _daysInYear[endYear]
+            yearsBetween = (endYear - startYear - 1)
             return fractionFirstYear + yearsBetween + fractionLastYear
+
+    @staticmethod
+    def actActIcma(start_date, end_date, reference_start, reference_end, frequency):
+        """Calculate day count fraction using ACT/ACT ICMA basis: the days over frequency times the days of the reference period"""
+        end_date = _calendar().validateDateRange(start_date, end_date)
+        DayCountBasis._validateReferencePeriod(reference_start, reference_end, frequency)
+        if not reference_start < reference_end:
+            raise ValueError("The reference period must not be empty")
+        if not reference_start <= start_date <= end_date <= reference_end:
+            raise ValueError("The dates must lie within the reference period")
+        return (end_date - start_date).days / (frequency * (reference_end - reference_start).days)
+
+    @staticmethod
+    def _validateReferencePeriod(reference_start, reference_end, frequency):
+        """Validate the reference period and coupon frequency of ACT/ACT ICMA"""
+        if reference_start is None or reference_end is None or frequency is None:
+            raise ValueError("The act/act icma basis requires reference_start, reference_end and frequency")
+        if not isinstance(frequency, int) or isinstance(frequency, bool) or frequency <= 0:
+            raise ValueError(f"Invalid frequency: {frequency}. Expected a positive number of periods per year.")
+
+    @staticmethod
+    def _yearsBackOrdinal(end_date, years):
+        """Return the ordinal of end_date moved back whole years, keeping the end of February at the end of February"""
+        year, month, day = end_date.year - years, end_date.month, end_date.day
+        leap = _daysInYear[year] == 366
+        if years and month == 2 and day >= 28:
+            day = 29 if leap else 28
+        return _yearStartOrdinal[year] + _monthStartDay[leap][month] + day - 1
+
+    @staticmethod
+    def actActAfb(start_date, end_date):
+        """Calculate day count fraction using ACT/ACT AFB basis: whole years counted back from end_date, then the remaining days over 365 or 366"""
+        end_date = _calendar().validateDateRange(start_date, end_date)
+        start = start_date.toordinal()
+        years = end_date.year - start_date.year
+        remainderEnd = DayCountBasis._yearsBackOrdinal(end_date, years)
+        if remainderEnd < start:
+            years -= 1
+            remainderEnd = DayCountBasis._yearsBackOrdinal(end_date, years)
+        # The remaining period is shorter than a year, so it contains at most one 29 February
+        denominator = 365
+        for year in (start_date.year, end_date.year - years):
+            if _daysInYear[year] == 366 and start <= _yearStartOrdinal[year] + 59 < remainderEnd:
+                denominator = 366
+        return years + (remainderEnd - start) / denominator
     
     @staticmethod
     def thirty360(start_date, end_date): # same as in the sigma function 30/360
         """Calculate day count fraction using 30/360 basis"""
-        end_date = Calendar.validateDateRange(start_date, end_date)
+        end_date = _calendar().validateDateRange(start_date, end_date)
         d1, m1, y1 = start_date.day, start_date.month, start_date.year
         d2, m2, y2 = end_date.day, end_date.month, end_date.year
         if d1 == 31:
@@ -90,7 +199,7 @@ class DayCountBasis:
     @staticmethod
     def thirty360e(start_date, end_date): # same as in the sigma function 30/360e
         """Calculate day count fraction using 30/360E basis"""
-        end_date = Calendar.validateDateRange(start_date, end_date)
+        end_date = _calendar().validateDateRange(start_date, end_date)
         d1, m1, y1 = start_date.day, start_date.month, start_date.year
         d2, m2, y2 = end_date.day, end_date.month, end_date.year
         if d1 == 31:
@@ -102,7 +211,7 @@ class DayCountBasis:
     @staticmethod
     def thirty360ee(start_date, end_date): # derived from the SAFM notes
         """Calculate day count fraction using 30/360EE basis"""
-        end_date = Calendar.validateDateRange(start_date, end_date)
+        end_date = _calendar().validateDateRange(start_date, end_date)
         d1, m1, y1 = start_date.day, start_date.month, start_date.year
         d2, m2, y2 = end_date.day, end_date.month, end_date.year
         if d1 == 31:
@@ -119,7 +228,208 @@ class DayCountBasis:
                 d2 = 30
         return ((360 * (y2 - y1)) + (30 * (m2 - m1)) + (d2 - d1)) / 360.0
 
+    def bus252(self, start_date, end_date):
+        """Calculate day count fraction using BUS/252 basis: business days from start_date (inclusive) to end_date (exclusive) over 252"""
+        # The calendar's cumulative business-day counts make this constant time for any period length
+        return self.calendar.numBusinessDaysBetween(start_date, end_date, "left") / 252.0
+
+    def dayCountFractionArray(self, start_dates, end_dates, reference_starts=None, reference_ends=None, frequency=None):
+        """Calculate day count fractions between arrays of start and end dates, returning a float64 array"""
+        start, end = self._validateDateArrays(start_dates, end_dates)
+        return self._fractionArray(start, end, self._dateComponentsArray(start), self._dateComponentsArray(end),
+                                   reference_starts, reference_ends, frequency)
+
+    def scheduleFractions(self, schedule_dates, mask=None, reference_starts=None, reference_ends=None, frequency=None, stub="front"):
+        """Calculate the accrual fractions of the periods between consecutive dates of one or many schedules
+
+        schedule_dates is a sorted date vector, or a 2-D array with one schedule per row; the result has one
+        fraction less per schedule. For ragged schedules, mask marks the valid dates (False for padding) and
+        periods next to a padded date are NaN. Unless reference periods shaped like the result are given,
+        ACT/ACT ICMA uses each regular period as its own reference period and measures the stub period (the
+        first one for stub="front", the last one for stub="back", as in Calendar.generateSchedule) against
+        notional regular periods of 12 / frequency months counted from its inner end.
+        """
+        import numpy as np
+        if stub not in ("front", "back"):
+            raise ValueError(f"Invalid stub type: '{stub}'. Expected 'front' or 'back'.")
+        dates = np.asarray(schedule_dates, dtype="datetime64[D]")
+        if dates.ndim not in (1, 2):
+            raise ValueError("Schedule dates must be a date vector or a 2-D array of schedules")
+        valid = np.ones(dates.shape, dtype=bool) if mask is None else np.broadcast_to(np.asarray(mask, dtype=bool), dates.shape)
+        validPeriods = valid[..., :-1] & valid[..., 1:]
+        if mask is not None:
+            # Padding takes the last valid date before it, so periods next to it are empty and validation skips it
+            startRange = np.datetime64(self._validRange()[0], "D")
+            position = np.maximum.accumulate(np.where(valid, np.arange(dates.shape[-1]), 0), axis=-1)
+            dates = np.take_along_axis(np.where(valid, dates, startRange), position, axis=-1)
+        # One validation and one component split for all dates, shared by the periods either side of each date
+        start, end = self._validateDateArrays(dates[..., :-1], dates[..., 1:], "Schedule dates must be sorted")
+        components = self._dateComponentsArray(dates)
+        derivedReferences = self.basis == DayCountConvention.ACT_ACT_ICMA and reference_starts is None and reference_ends is None
+        if derivedReferences:
+            reference_starts, reference_ends = start, end
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fractions = self._fractionArray(start, end, tuple(c[..., :-1] for c in components), tuple(c[..., 1:] for c in components),
+                                            reference_starts, reference_ends, frequency, validPeriods)
+        if derivedReferences and start.shape[-1]:
+            # The stub of each schedule is its first (or last) valid period
+            if stub == "front":
+                stubIndex = np.argmax(validPeriods, axis=-1)
+            else:
+                stubIndex = validPeriods.shape[-1] - 1 - np.argmax(validPeriods[..., ::-1], axis=-1)
+            stubIndex = stubIndex[..., np.newaxis]
+            np.put_along_axis(fractions, stubIndex, self._icmaStubArray(np.take_along_axis(start, stubIndex, axis=-1),
+                                                                        np.take_along_axis(end, stubIndex, axis=-1), frequency, stub), axis=-1)
+        return fractions if mask is None else np.where(validPeriods, fractions, np.nan)
+
+    def _fractionArray(self, start, end, startComponents, endComponents, reference_starts, reference_ends, frequency, valid=True):
+        """Calculate day count fractions from validated datetime64[D] arrays and their date components"""
+        # The fractions use the same integer numerators and float divisions as the scalar methods, so they are bit-identical
+        if self.basis == DayCountConvention.ACT_365:
+            return (endComponents[3] - startComponents[3]) / 365.0
+
+        elif self.basis == DayCountConvention.ACT_360:
+            return (endComponents[3] - startComponents[3]) / 360.0
+
+        elif self.basis in (DayCountConvention.ACT_ACT, DayCountConvention.ACT_ACT_ISDA):
+            return self._actActArray(startComponents, endComponents)
+
+        elif self.basis == DayCountConvention.ACT_ACT_ICMA:
+            return self._actActIcmaArray(start, end, reference_starts, reference_ends, frequency, valid)
+
+        elif self.basis == DayCountConvention.ACT_ACT_AFB:
+            return self._actActAfbArray(startComponents, endComponents)
+
+        elif self.basis in (DayCountConvention.THIRTY_360, DayCountConvention.THIRTY_360E, DayCountConvention.THIRTY_360EE):
+            return self._thirty360Array(startComponents, endComponents, self.basis)
+
+        elif self.basis == DayCountConvention.BUS_252:
+            return self.calendar.numBusinessDaysBetweenArray(start, end, "left") / 252.0
+
+        else:
+            raise ValueError("Unsupported basis input")
+
+    def _validRange(self):
+        """Return the valid date range of this basis: its calendar's for BUS/252, else Calendar.validDateRange"""
+        return self.calendar.validDateRange if self.basis == DayCountConvention.BUS_252 else _calendar().validDateRange
+
+    def _validateDateArrays(self, start_dates, end_dates, orderMessage="endDate must be greater than or equal to startDate"):
+        """Convert start and end dates to broadcast datetime64[D] arrays, validating the date range once for all of them"""
+        import numpy as np
+        start, end = np.broadcast_arrays(*Validation.validateDates(start_dates, end_dates, validRange=self._validRange()))
+        if (end < start).any():
+            raise ValueError(orderMessage)
+        return start, end
+
+    @staticmethod
+    def _dateComponentsArray(days):
+        """Split datetime64[D] days into year, month, day and ordinal arrays in one pass"""
+        import numpy as np
+        years, months = days.astype("datetime64[Y]"), days.astype("datetime64[M]")
+        return (years.astype(np.int64) + 1970, (months - years).astype(np.int64) + 1,
+                (days - months.astype("datetime64[D]")).astype(np.int64) + 1,
+                (days - np.datetime64("0001-01-01", "D")).astype(np.int64) + 1)
+
+    @staticmethod
+    def _actActArray(startComponents, endComponents):
+        """Calculate day count fractions using ACT/ACT ISDA basis from date components"""
+        import numpy as np
+        yearStartOrdinal, daysInYear, monthStartDay = _yearTables()
+        startYear, startOrdinal = startComponents[0], startComponents[3]
+        endYear, endOrdinal = endComponents[0], endComponents[3]
+        fractionFirstYear = (yearStartOrdinal[startYear + 1] - startOrdinal) / daysInYear[startYear]
+        fractionLastYear = (endOrdinal - yearStartOrdinal[endYear]) / daysInYear[endYear]
+        yearsBetween = endYear - startYear - 1
+        return np.where(startYear == endYear, (endOrdinal - startOrdinal) / daysInYear[startYear],
+                        fractionFirstYear + yearsBetween + fractionLastYear)
+
+    @classmethod
+    def _actActIcmaArray(cls, start, end, reference_starts, reference_ends, frequency, valid=True):
+        """Calculate day count fractions using ACT/ACT ICMA basis for validated datetime64[D] arrays"""
+        import numpy as np
+        cls._validateReferencePeriod(reference_starts, reference_ends, frequency)
+        start, end, referenceStart, referenceEnd = np.broadcast_arrays(start, end, np.asarray(reference_starts, dtype="datetime64[D]"),
+                                                                       np.asarray(reference_ends, dtype="datetime64[D]"))
+        invalid = ~np.asarray(valid)
+        if not ((referenceStart < referenceEnd) | invalid).all():
+            raise ValueError("The reference period must not be empty")
+        if not ((referenceStart <= start) & (end <= referenceEnd) | invalid).all():
+            raise ValueError("The dates must lie within the reference period")
+        return (end - start).astype(np.int64) / (frequency * (referenceEnd - referenceStart).astype(np.int64))
+
+    @staticmethod
+    def _icmaStubArray(start, end, frequency, stub):
+        """Calculate ACT/ACT ICMA fractions of stub periods, summing the days in each notional regular period of
+        12 / frequency months counted back from the end of a front stub or forward from the start of a back stub"""
+        import numpy as np
+        if 12 % frequency:
+            raise ValueError(f"Cannot derive reference periods for frequency {frequency}; pass reference_starts and reference_ends")
+        months = 12 // frequency if stub == "back" else -(12 // frequency)
+        anchor = end if stub == "front" else start
+        anchorMonth = anchor.astype("datetime64[M]")
+        # Like generateSchedule with preserveMonthEnd, an anchor at the end of a month keeps the notional dates at month ends
+        atMonthEnd = (anchor + 1).astype("datetime64[M]") != anchorMonth
+        fractions = np.zeros(anchor.shape)
+        inner, step = anchor, 1
+        while True:
+            outer = np.where(atMonthEnd, (anchorMonth + step * months + 1).astype("datetime64[D]") - 1,
+                             _calendar()._addMonthsArray(anchor, step * months))
+            periodStart, periodEnd = (outer, inner) if stub == "front" else (inner, outer)
+            days = (np.minimum(end, periodEnd) - np.maximum(start, periodStart)).astype(np.int64)
+            fractions += np.maximum(days, 0) / (frequency * (periodEnd - periodStart).astype(np.int64))
+            if (outer <= start).all() if stub == "front" else (outer >= end).all():
+                return fractions
+            inner, step = outer, step + 1
+
+    @staticmethod
+    def _actActAfbArray(startComponents, endComponents):
+        """Calculate day count fractions using ACT/ACT AFB basis from date components"""
+        import numpy as np
+        yearStartOrdinal, daysInYear, monthStartDay = _yearTables()
+        startYear, startOrdinal = startComponents[0], startComponents[3]
+        endYear, endMonth, endDay = endComponents[:3]
+
+        def yearsBackOrdinal(years):
+            year = endYear - years
+            leap = (daysInYear[year] == 366).astype(np.int64)
+            day = np.where((years > 0) & (endMonth == 2) & (endDay >= 28), 28 + leap, endDay)
+            return yearStartOrdinal[year] + monthStartDay[leap, endMonth] + day - 1
+
+        years = endYear - startYear
+        remainderEnd = yearsBackOrdinal(years)
+        short = remainderEnd < startOrdinal
+        years = years - short
+        remainderEnd = np.where(short, yearsBackOrdinal(years), remainderEnd)
+        hasLeapDay = np.zeros(np.shape(startOrdinal), dtype=bool)
+        for year in (startYear, endYear - years):
+            leapDay = yearStartOrdinal[year] + 59
+            hasLeapDay |= (daysInYear[year] == 366) & (startOrdinal <= leapDay) & (leapDay < remainderEnd)
+        return years + (remainderEnd - startOrdinal) / np.where(hasLeapDay, 366, 365)
+
+    @staticmethod
+    def _thirty360Array(startComponents, endComponents, basis):
+        """Calculate day count fractions using the 30/360, 30/360E or 30/360EE basis from date components"""
+        import numpy as np
+        y1, m1, d1 = startComponents[:3]
+        y2, m2, d2 = endComponents[:3]
+        d1 = np.where(d1 == 31, 30, d1)
+        if basis == DayCountConvention.THIRTY_360:
+            d2 = np.where((d2 == 31) & (d1 == 30), 30, d2)
+        elif basis == DayCountConvention.THIRTY_360E:
+            d2 = np.where(d2 == 31, 30, d2)
+        else:
+            # A 31st end date rolls to the 1st of the next month if the start day is before the 30th; rolling
+            # December into January of the next year adds the same 30 days as adding one to the month
+            rollToNextMonth = (d2 == 31) & (d1 < 30)
+            m2 = m2 + rollToNextMonth
+            d2 = np.where(rollToNextMonth, 1, np.where(d2 == 31, 30, d2))
+        return ((360 * (y2 - y1)) + (30 * (m2 - m1)) + (d2 - d1)) / 360.0
+
 
+# Methods measured while metrics are enabled (see Metrics)
+instrument(DayCountBasis, {"dayCountFraction": None, "actAct": None, "thirty360": None, "thirty360e": None, "thirty360ee": None,
+                           "actActIcma": None, "actActAfb": None, "bus252": None, "dayCountFractionArray": None,
+                           "scheduleFractions": None})
 
 
 # dcb = DayCountBasis('act/360')
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Rule-based holiday source for Calendar: fixed dates, nth weekdays and Easter-relative dates with
+weekend substitution, generated one year at a time and memoized per country and year. A Calendar built on a
+source generates every year of its validDateRange up front, which Calendar.maxValidDateRangeYears bounds
+"""
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+try:
+    from .Metrics import currentMetrics, instrument
+except ImportError:
+    from Metrics import currentMetrics, instrument
+
+# Weekend substitution rules map the weekday a holiday falls on to the direction in which its observed
+# day is searched for (1 forwards, -1 backwards), skipping weekend days and other holidays
+SUNDAY_TO_MONDAY = {6: 1}
+NEAREST_WEEKDAY = {5: -1, 6: 1}
+FOLLOWING_WEEKDAY = {5: 1, 6: 1}
+
+
+def easterSunday(year):
+    """Return the date of Easter Sunday in the Gregorian calendar (anonymous Gregorian algorithm)"""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+class HolidayRule(ABC):
+    def __init__(self, name, substitute=None, firstYear=None, lastYear=None):
+        self.name = name
+        self.substitute = substitute or {}
+        self.firstYear = firstYear
+        self.lastYear = lastYear
+
+    def appliesTo(self, year):
+        """Check if the rule is in force in a given year"""
+        return (self.firstYear is None or year >= self.firstYear) and (self.lastYear is None or year <= self.lastYear)
+
+    @abstractmethod
+    def date(self, year):
+        """Return the date of the holiday in a given year"""
+
+
+class FixedDateRule(HolidayRule):
+    def __init__(self, month, day, name, substitute=None, firstYear=None, lastYear=None):
+        super().__init__(name, substitute, firstYear, lastYear)
+        self.month = month
+        self.day = day
+
+    def date(self, year):
+        """Return the date of the holiday in a given year"""
+        return date(year, self.month, self.day)
+
+
+class NthWeekdayRule(HolidayRule):
+    def __init__(self, month, weekday, n, name, substitute=None, firstYear=None, lastYear=None):
+        if n == 0 or not -5 <= n <= 5:
+            raise ValueError(f"Invalid n: {n}. Expected 1 to 5, or -1 to -5 to count from the month end.")
+        super().__init__(name, substitute, firstYear, lastYear)
+        self.month = month
+        self.weekday = weekday
+        self.n = n
+
+    def date(self, year):
+        """Return the date of the holiday in a given year"""
+        if self.n > 0:
+            first = date(year, self.month, 1)
+            return first + timedelta(days=(self.weekday - first.weekday()) % 7 + 7 * (self.n - 1))
+        last = (date(year + 1, 1, 1) if self.month == 12 else date(year, self.month + 1, 1)) - timedelta(days=1)
+        return last - timedelta(days=(last.weekday() - self.weekday) % 7 + 7 * (-self.n - 1))
+
+
+class EasterRule(HolidayRule):
+    def __init__(self, offset, name, substitute=None, firstYear=None, lastYear=None):
+        super().__init__(name, substitute, firstYear, lastYear)
+        self.offset = offset
+
+    def date(self, year):
+        """Return the date of the holiday in a given year"""
+        return easterSunday(year) + timedelta(days=self.offset)
+
+
+class RuleHolidaySource:
+    def __init__(self):
+        self._rules = {}
+        self._weekendDays = {}
+        self._years = {}  # (country code, year) -> tuple of (date, name), generated on first use
+        self.version = 0  # Bumped by addCountry so that calendars built on the source rebuild their cached masks
+
+    def addCountry(self, countryCode, rules, weekendDays=(5, 6)):
+        """Register the holiday rules and weekend weekdays of a country"""
+        countryCode = countryCode.upper()
+        self._rules[countryCode] = tuple(rules)
+        self._weekendDays[countryCode] = tuple(sorted(weekendDays))
+        for key in [key for key in self._years if key[0] == countryCode]:
+            del self._years[key]
+        self.version += 1
+        return self
+
+    @property
+    def countries(self):
+        """Country codes with registered rules"""
+        return frozenset(self._rules)
+
+    def weekendDays(self, countryCode):
+        """Return the weekend weekdays of a country"""
+        return self._weekendDays[countryCode]
+
+    def holidays(self, countryCode, year):
+        """Return a country's holidays generated from its rules for one year as (date, name) tuples sorted by date"""
+        key = (countryCode, year)
+        holidays = self._years.get(key)
+        if holidays is None:
+            if currentMetrics() is not None:
+                currentMetrics().recordMiss("RuleHolidaySource.holidays")
+            holidays = self._years[key] = self._generate(countryCode, year)
+        return holidays
+
+    def holidaysBetween(self, countryCode, startDate, endDate):
+        """Return a country's holidays between two dates, inclusive, as (date, name) tuples sorted by date"""
+        # Substituted days can move into a neighbouring year, so the years either side are included
+        return sorted(holiday for year in range(startDate.year - 1, endDate.year + 2)
+                      for holiday in self.holidays(countryCode, year) if startDate <= holiday[0] <= endDate)
+
+    def _generate(self, countryCode, year):
+        """Apply a country's rules to one year, adding an observed day for each substituted holiday"""
+        weekendDays = self._weekendDays[countryCode]
+        # Rules that fall on the same date keep their registration order
+        actual = sorted(((rule.date(year), rule) for rule in self._rules[countryCode] if rule.appliesTo(year)), key=lambda item: item[0])
+        taken = {holiday for holiday, _ in actual}
+        holidays = [(holiday, rule.name) for holiday, rule in actual]
+        for holiday, rule in actual:
+            direction = rule.substitute.get(holiday.weekday())
+            if direction is None:
+                continue
+            observed = holiday + timedelta(days=direction)
+            while observed.weekday() in weekendDays or observed in taken:
+                observed += timedelta(days=direction)
+            taken.add(observed)
+            holidays.append((observed, f"{rule.name} (observed)"))
+        return tuple(sorted(holidays))
+
+    @classmethod
+    def default(cls):
+        """Return a source with built-in rules for South Africa and the United States federal holidays"""
+        return cls().addCountry("ZA", [
+            FixedDateRule(1, 1, "New Year's Day", SUNDAY_TO_MONDAY),
+            FixedDateRule(3, 21, "Human Rights Day", SUNDAY_TO_MONDAY),
+            EasterRule(-2, "Good Friday"),
+            EasterRule(1, "Family Day"),
+            FixedDateRule(4, 27, "Freedom Day", SUNDAY_TO_MONDAY),
+            FixedDateRule(5, 1, "Workers' Day", SUNDAY_TO_MONDAY),
+            FixedDateRule(6, 16, "Youth Day", SUNDAY_TO_MONDAY),
+            FixedDateRule(8, 9, "National Women's Day", SUNDAY_TO_MONDAY),
+            FixedDateRule(9, 24, "Heritage Day", SUNDAY_TO_MONDAY),
+            FixedDateRule(12, 16, "Day of Reconciliation", SUNDAY_TO_MONDAY),
+            FixedDateRule(12, 25, "Christmas Day", SUNDAY_TO_MONDAY),
+            FixedDateRule(12, 26, "Day of Goodwill", SUNDAY_TO_MONDAY),
+        ]).addCountry("US", [
+            FixedDateRule(1, 1, "New Year's Day", NEAREST_WEEKDAY),
+            NthWeekdayRule(1, 0, 3, "Martin Luther King, Jr. Day", firstYear=1986),
+            NthWeekdayRule(2, 0, 3, "Washington's Birthday"),
+            NthWeekdayRule(5, 0, -1, "Memorial Day"),
+            FixedDateRule(6, 19, "Juneteenth National Independence Day", NEAREST_WEEKDAY, firstYear=2021),
+            FixedDateRule(7, 4, "Independence Day", NEAREST_WEEKDAY),
+            NthWeekdayRule(9, 0, 1, "Labor Day"),
+            NthWeekdayRule(10, 0, 2, "Columbus Day"),
+            FixedDateRule(11, 11, "Veterans Day", NEAREST_WEEKDAY),
+            NthWeekdayRule(11, 3, 4, "Thanksgiving Day"),
+            FixedDateRule(12, 25, "Christmas Day", NEAREST_WEEKDAY),
+        ])
+
+
+# Methods measured while metrics are enabled (see Metrics)
+instrument(RuleHolidaySource, {"holidays": "cache", "holidaysBetween": None})
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in metrics for Calendar, DayCountBasis, Rate and HolidayRules: per-method call counts and cumulative
+time, loop iteration counts and cache hit/miss counts, collected globally or for a single calendar
+
+Loop iterations are only recorded for methods registered with a loop counter. Calendar rolls dates and
+steps over business days with table lookups instead of loops, so it records none; its call counts show
+how often those lookups ran.
+
+    metrics = enableMetrics()            # or calendar.enableMetrics() for one calendar
+    ...
+    metrics.asDict()
+    disableMetrics()
+
+Modules register the methods they want measured with instrument(). The wrappers are only installed on
+the classes while some metrics are enabled and the original methods are restored when the last are
+disabled, so disabled metrics cost nothing.
+"""
+import threading
+import time
+import weakref
+
+_registered = []  # (class, {method name: loop counter or None})
+_originals = {}  # (class, method name) -> original attribute, while the wrappers are installed
+_owners = weakref.WeakSet()  # Objects with their own metrics (see register)
+_globalMetrics = None
+
+
+class Metrics:
+    def __init__(self, callback=None):
+        self.callback = callback  # Called as callback(kind, name, value) for every "call", "loop" and "miss" record
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear all recorded values"""
+        with self._lock:
+            self.calls = {}  # Method name -> number of calls
+            self.times = {}  # Method name -> cumulative seconds, including nested instrumented calls
+            self.loops = {}  # Method name -> loop iterations reported by the method's loop counter
+            self.misses = {}  # Cache accessor name -> cache misses; the other calls were hits
+
+    def recordCall(self, name, elapsed):
+        """Record one call of a method and the time it took"""
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            self.times[name] = self.times.get(name, 0.0) + elapsed
+        if self.callback is not None:
+            self.callback("call", name, elapsed)
+
+    def recordLoop(self, name, iterations):
+        """Record the loop iterations of one call of a method"""
+        with self._lock:
+            self.loops[name] = self.loops.get(name, 0) + int(iterations)
+        if self.callback is not None:
+            self.callback("loop", name, int(iterations))
+
+    def recordMiss(self, name):
+        """Record a cache miss in a cache accessor"""
+        with self._lock:
+            self.misses[name] = self.misses.get(name, 0) + 1
+        if self.callback is not None:
+            self.callback("miss", name, 1)
+
+    def cacheStats(self):
+        """Return the hits, misses and hit ratio of each cache accessor that has been called"""
+        with self._lock:
+            stats = {}
+            for name, misses in self.misses.items():
+                calls = max(self.calls.get(name, 0), misses)
+                stats[name] = {"hits": calls - misses, "misses": misses, "hitRatio": (calls - misses) / calls}
+            for name in _cacheNames():
+                if name not in stats and self.calls.get(name):
+                    stats[name] = {"hits": self.calls[name], "misses": 0, "hitRatio": 1.0}
+            return stats
+
+    def asDict(self):
+        """Export the recorded values as a dictionary of plain numbers"""
+        caches = self.cacheStats()
+        with self._lock:
+            return {
+                "calls": {name: {"count": count, "time": self.times[name]} for name, count in self.calls.items()},
+                "loops": dict(self.loops),
+                "caches": caches,
+            }
+
+
+def _cacheNames():
+    """Return the names of the registered cache accessors"""
+    return [f"{cls.__name__}.{name}" for cls, methods in _registered for name, counter in methods.items() if counter == "cache"]
+
+
+def instrument(cls, methods):
+    """Register methods of a class to be measured, mapping each name to a loop counter, "cache" or None
+
+    A loop counter is called with the result and the arguments of a call and returns its loop iterations.
+    Cache accessors record their misses with currentMetrics(owner).recordMiss; every other call is a hit.
+    """
+    _registered.append((cls, methods))
+    if _originals:
+        _install(cls, methods)
+
+
+def _install(cls, methods):
+    """Replace the registered methods of a class with measuring wrappers"""
+    for name, counter in methods.items():
+        if (cls, name) in _originals:
+            continue
+        original = cls.__dict__[name]
+        _originals[(cls, name)] = original
+        if isinstance(original, staticmethod):
+            setattr(cls, name, staticmethod(_wrap(original.__func__, f"{cls.__name__}.{name}", counter, hasOwner=False)))
+        elif isinstance(original, classmethod):
+            setattr(cls, name, classmethod(_wrap(original.__func__, f"{cls.__name__}.{name}", counter, hasOwner=True)))
+        else:
+            setattr(cls, name, _wrap(original, f"{cls.__name__}.{name}", counter, hasOwner=True))
+
+
+def _wrap(function, name, counter, hasOwner):
+    """Return a wrapper that records the calls, time and loop iterations of a function"""
+    loopCounter = counter if callable(counter) else None
+
+    def wrapper(*args, **kwargs):
+        metrics = currentMetrics(args[0] if hasOwner else None)
+        if metrics is None:
+            return function(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            metrics.recordCall(name, time.perf_counter() - start)
+        if loopCounter is not None:
+            metrics.recordLoop(name, loopCounter(result, *args[hasOwner:], **kwargs))
+        return result
+
+    wrapper.__name__, wrapper.__qualname__, wrapper.__doc__ = function.__name__, function.__qualname__, function.__doc__
+    wrapper.__wrapped__ = function
+    return wrapper
+
+
+def _installAll():
+    for cls, methods in _registered:
+        _install(cls, methods)
+
+
+def _uninstallIfUnused():
+    """Restore the original methods once no metrics are enabled"""
+    if _globalMetrics is None and not any(getattr(owner, "metrics", None) is not None for owner in _owners):
+        for (cls, name), original in _originals.items():
+            setattr(cls, name, original)
+        _originals.clear()
+
+
+def currentMetrics(owner=None):
+    """Return the metrics collecting for an object (its own, else the global metrics), or None if disabled"""
+    return getattr(owner, "metrics", None) or _globalMetrics
+
+
+def enableMetrics(metrics=None):
+    """Collect metrics for all instrumented classes, returning the Metrics that collects them"""
+    global _globalMetrics
+    _globalMetrics = metrics or Metrics()
+    _installAll()
+    return _globalMetrics
+
+
+def disableMetrics():
+    """Stop collecting global metrics, returning the Metrics that collected them"""
+    global _globalMetrics
+    metrics, _globalMetrics = _globalMetrics, None
+    _uninstallIfUnused()
+    return metrics
+
+
+def register(owner):
+    """Install the wrappers for an object that has set its own metrics attribute"""
+    _owners.add(owner)
+    if owner.metrics is None:
+        _uninstallIfUnused()
+    else:
+        _installAll()
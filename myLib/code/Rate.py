@@ -7,6 +7,12 @@ Created on Tue Jun 18 10:47:20 2024
 
 import math
 import enum
+try:
+    from . import Validation
+    from .Metrics import instrument
+except ImportError:
+    import Validation
+    from Metrics import instrument
 
 class CompoundingFrequency(enum.Enum):
     NACA = 1  # Annual compounding
@@ -18,7 +24,7 @@ class CompoundingFrequency(enum.Enum):
 
     @classmethod
     def getPeriodsPerYear(cls, compounding):
-        if not isinstance(compounding, cls):
+        if not Validation.isTrusted() and not isinstance(compounding, cls):
             raise ValueError(f"Invalid compounding frequency: {compounding}")
         if compounding == cls.NACC:
             return math.inf
@@ -92,7 +98,8 @@ class Rate:
             return (1 + rate / periods_per_year) ** (-periods_per_year * day_count_factor)
 
 
-
+# Methods measured while metrics are enabled (see Metrics)
+instrument(Rate, {"equivalentRate": None, "discountFactor": None})
 
 
 # from datetime import date
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Trusted batch mode: validate a batch's dates once at the boundary, then let Calendar, DayCountBasis and
+Rate skip re-validating their inputs inside the block
+
+    with trusted(startDates, endDates):
+        fractions = [dcb.dayCountFraction(s, e) for s, e in zip(startDates, endDates)]
+
+Inside the block Calendar.validateDateRange and DayCountBasis only check that start dates are not after
+end dates, not the range of each date, and Rate does not re-check its compounding frequencies. Lookups
+that would index past the business-day tables still raise. The block needs the dates it vouches for. The mode is local to the thread (and asyncio task) that entered the
+block, so concurrent callers on other threads keep full validation.
+"""
+import contextvars
+from contextlib import contextmanager
+
+# Number of active trusted() blocks in the current context; validation is skipped while it is positive
+_trustedDepth = contextvars.ContextVar("trustedDepth", default=0)
+
+
+def isTrusted():
+    """Check if the current thread or task is inside a trusted() block"""
+    return _trustedDepth.get() > 0
+
+
+def validateDates(*dates, validRange=None):
+    """Validate dates, lists of dates or datetime64[D] arrays against validRange (by default
+    Calendar.validDateRange) in one pass each, returning them as datetime64[D] arrays"""
+    import numpy as np
+    if validRange is None:
+        try:
+            from .Calendar import Calendar
+        except ImportError:
+            from Calendar import Calendar
+        validRange = Calendar.validDateRange
+    startRange, endRange = validRange
+    first, last = np.datetime64(startRange, "D"), np.datetime64(endRange, "D")
+    arrays = []
+    for givenDates in dates:
+        days = np.asarray(givenDates, dtype="datetime64[D]")
+        outOfRange = np.isnat(days) | (days < first) | (days > last)
+        if outOfRange.any():
+            raise ValueError(f"Date {days[outOfRange].ravel()[0]} is out of the valid range: {startRange} to {endRange}")
+        arrays.append(days)
+    return arrays
+
+
+@contextmanager
+def trusted(*dates):
+    """Validate the given dates once, then skip input validation until the block exits"""
+    if not dates:
+        # Without dates nothing would have been validated, so there is nothing to trust
+        raise ValueError("trusted() needs the dates to validate")
+    validateDates(*dates)
+    token = _trustedDepth.set(_trustedDepth.get() + 1)
+    try:
+        yield
+    finally:
+        _trustedDepth.reset(token)
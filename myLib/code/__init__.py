@@ -4,6 +4,15 @@ Created on Tue Jun 18 11:44:11 2024
 
 @author: ButlerMasango
 """
+import importlib
 
+__all__ = ["Calendar", "Date", "Rate", "DayCountBasis", "HolidayRules", "Metrics", "Validation"]
 
 
+def __getattr__(name):
+    """Import submodules on first access so that importing the package stays cheap"""
+    if name in __all__:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,9 +7,11 @@ Created on Wed Jun 19 12:39:03 2024
 
 import unittest
 from datetime import date, datetime, timedelta
+import numpy as np
 import pandas as pd
 import os
 import sys
+import tempfile
 
 # Adjust the path to import Calendar from Calendar in the code folder
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'code')))
@@ -29,6 +31,170 @@ class TestInvalidCountryCodes(unittest.TestCase):
             Calendar.Calendar("ZA+invalidCode")
         self.assertIn("Invalid Country code", str(context.exception))
 
+        # The registry validates country codes in the same way
+        with self.assertRaises(ValueError) as context:
+            Calendar.Calendar.get("ZA+invalidCode")
+        self.assertIn("Invalid Country code", str(context.exception))
+
+
+class TestCalendarRegistry(unittest.TestCase):
+    def test_get(self):
+        # Repeated lookups share one calendar regardless of case
+        calendar = Calendar.Calendar.get("za+EG")
+        self.assertIs(Calendar.Calendar.get("ZA+eg"), calendar)
+        self.assertEqual(calendar.countryCodes, ("ZA", "EG"))
+        self.assertTrue(calendar.frozen)
+
+        # Calendars built directly see the same holidays as the shared one
+        direct = Calendar.Calendar("za+EG")
+        self.assertIsNot(direct, calendar)
+        self.assertEqual(len(direct.holidayData), len(calendar.holidayData))
+        self.assertEqual(direct.addBusinessDays(date(2024, 7, 3), 3), calendar.addBusinessDays(date(2024, 7, 3), 3))
+
+    def test_patch(self):
+        # Shared calendars are patched through Calendar.patch, which publishes a new snapshot on exit
+        before = Calendar.Calendar.get("ZA")
+        with self.assertRaises(ValueError):
+            before.addHoliday(date(2024, 7, 3), "Closure", "ZA")
+        with Calendar.Calendar.patch("za") as calendar:
+            self.assertFalse(calendar.frozen)
+            calendar.addHoliday(date(2024, 7, 3), "Closure", "ZA")
+            self.assertIs(Calendar.Calendar.get("ZA"), before)
+        after = Calendar.Calendar.get("ZA")
+        self.assertTrue(after.frozen)
+        self.assertTrue(before.isBusinessDay(date(2024, 7, 3)))
+        self.assertFalse(after.isBusinessDay(date(2024, 7, 3)))
+
+        with Calendar.Calendar.patch("ZA") as calendar:
+            calendar.removeHoliday(date(2024, 7, 3), "ZA")
+        self.assertTrue(Calendar.Calendar.get("ZA").isBusinessDay(date(2024, 7, 3)))
+        self.assertFalse(after.isBusinessDay(date(2024, 7, 3)))
+
+    def test_concurrentPatches(self):
+        # Readers of the shared calendar always see a consistent mask and cumulative counts
+        import threading
+        start, end = date(2024, 7, 1), date(2024, 7, 31)
+        days = np.arange(np.datetime64(start), np.datetime64(end) + 1)
+        stop, mismatches = threading.Event(), []
+
+        def read():
+            while not stop.is_set():
+                calendar = Calendar.Calendar.get("ZA")
+                if calendar.numBusinessDaysBetween(start, end) != calendar.isBusinessDayArray(days).sum():
+                    mismatches.append(calendar.version)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for _ in range(50):
+            with Calendar.Calendar.patch("ZA") as calendar:
+                calendar.addHoliday(date(2024, 7, 3), "Closure", "ZA")
+            with Calendar.Calendar.patch("ZA") as calendar:
+                calendar.removeHoliday(date(2024, 7, 3), "ZA")
+        stop.set()
+        for reader in readers:
+            reader.join()
+        self.assertEqual(mismatches, [])
+
+
+class TestWeekendMasks(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w") as f:
+            f.write("Country Code,Weekend Type,Effective Date\n"
+                    "ZA,Sunday,\n"
+                    "EG,Saturday-Sunday,2024-07-01\n"
+                    "EG,Friday-Saturday,\n"
+                    "US,Fri+Sun,\n")
+        Calendar.Calendar.weekendPath = self.path
+
+    def tearDown(self):
+        Calendar.Calendar.weekendPath = "country_weekend_types.csv"
+        Calendar.Calendar.compiledPath = None
+        Calendar.Calendar._sourceCache.clear()
+        os.remove(self.path)
+
+    def test_weekendMaskFromType(self):
+        self.assertEqual(Calendar.Calendar.weekendMaskFromType("Saturday-Sunday"), 0b1100000)
+        self.assertEqual(Calendar.Calendar.weekendMaskFromType("Friday-Monday"), 0b1110001)
+        self.assertEqual(Calendar.Calendar.weekendMaskFromType("fri, sun"), 0b1010000)
+        self.assertEqual(Calendar.Calendar.weekendMaskFromType("None"), 0)
+        self.assertEqual(Calendar.Calendar.weekendMaskFromType(96), 96)
+        self.assertEqual(Calendar.Calendar.weekendMaskFromType(0), 0)
+        for weekendType in ("Weekend", "", " ", float("nan"), "nan"):
+            with self.assertRaises(ValueError):
+                Calendar.Calendar.weekendMaskFromType(weekendType)
+        with self.assertRaises(ValueError):
+            Calendar.Calendar.weekendMaskFromType(128)
+
+    def test_customWeekends(self):
+        calendar = Calendar.Calendar("ZA")
+        self.assertEqual(calendar.weekendTypes["ZA"], (6,))
+        self.assertFalse(calendar.isWeekend(date(2024, 7, 6)))  # Saturday
+        self.assertTrue(calendar.isWeekend(date(2024, 7, 7)))  # Sunday
+        self.assertEqual(calendar.addBusinessDays(date(2024, 7, 5), 1), date(2024, 7, 6))
+
+        calendar = Calendar.Calendar("US")
+        self.assertTrue(calendar.isWeekend(date(2024, 7, 5)))  # Friday
+        self.assertFalse(calendar.isWeekend(date(2024, 7, 6)))  # Saturday
+
+    def test_weekendHistory(self):
+        # EG moves from a Friday-Saturday to a Saturday-Sunday weekend on 2024-07-01
+        calendar = Calendar.Calendar("EG")
+        self.assertEqual(calendar.weekendTypes["EG"], (5, 6))
+        self.assertTrue(calendar.isWeekend(date(2024, 6, 28)))  # Friday
+        self.assertFalse(calendar.isWeekend(date(2024, 6, 30)))  # Sunday
+        self.assertFalse(calendar.isWeekend(date(2024, 7, 5)))  # Friday
+        self.assertTrue(calendar.isWeekend(date(2024, 7, 7)))  # Sunday
+
+        # Compiled calendars keep the history
+        handle, path = tempfile.mkstemp(suffix=".bin")
+        os.close(handle)
+        try:
+            Calendar.Calendar.compile(path)
+            Calendar.Calendar.compiledPath = path
+            compiled = Calendar.Calendar("EG")
+            dates = np.arange(np.datetime64("2020-01-01"), np.datetime64("2057-01-01"))
+            self.assertEqual(compiled.isWeekendArray(dates).tolist(), calendar.isWeekendArray(dates).tolist())
+            self.assertEqual(compiled.isBusinessDayArray(dates).tolist(), calendar.isBusinessDayArray(dates).tolist())
+        finally:
+            Calendar.Calendar.compiledPath = None
+            Calendar.Calendar._sourceCache.clear()
+            os.remove(path)
+
+
+class TestCompiledCalendar(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".bin")
+        os.close(handle)
+        Calendar.Calendar.compile(self.path)
+
+    def tearDown(self):
+        Calendar.Calendar.compiledPath = None
+        Calendar.Calendar._sourceCache.clear()
+        os.remove(self.path)
+
+    def test_compiledMatchesCsv(self):
+        expected = Calendar.Calendar("za+EG")
+        Calendar.Calendar.compiledPath = self.path
+        compiled = Calendar.Calendar("za+EG")
+
+        self.assertEqual(compiled.weekendTypes["EG"], expected.weekendTypes["EG"])
+        self.assertTrue(compiled.holidayData.equals(expected.holidayData))
+        dates = np.arange(np.datetime64("2020-01-01"), np.datetime64("2057-01-01"))
+        self.assertEqual(compiled.isBusinessDayArray(dates).tolist(), expected.isBusinessDayArray(dates).tolist())
+        self.assertEqual(compiled.addBusinessDays(date(2024, 7, 3), 3), date(2024, 7, 9))
+
+        # Invalid country codes are still rejected
+        with self.assertRaises(ValueError):
+            Calendar.Calendar("ZA+invalidCode")
+
+    def test_invalidCompiledFile(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a calendar" * 10)
+        Calendar.Calendar.compiledPath = self.path
+        with self.assertRaises(ValueError):
+            Calendar.Calendar("ZA")
 
 
 class TestCalendar(unittest.TestCase):
@@ -57,9 +223,141 @@ class TestCalendar(unittest.TestCase):
         self.assertFalse(self.calendar.isBusinessDay(public_holiday_za))
 
         # Test non-holiday weekday
-        non_holiday_weekday = date(2024, 7, 8) 
+        non_holiday_weekday = date(2024, 7, 8)
         self.assertTrue(self.calendar.isBusinessDay(non_holiday_weekday))
 
+        # Test dates out of range
+        with self.assertRaises(ValueError):
+            self.calendar.isBusinessDay(date(2019, 12, 31))
+        with self.assertRaises(ValueError):
+            self.calendar.isBusinessDay(date(2057, 1, 1))
+
+    def test_isWeekend(self):
+        # Weekend is the union of the ZA and EG weekends (Friday to Sunday)
+        self.assertTrue(self.calendar.isWeekend(date(2024, 7, 5)))  # Friday
+        self.assertTrue(self.calendar.isWeekend(date(2024, 7, 6)))  # Saturday
+        self.assertTrue(self.calendar.isWeekend(date(2024, 7, 7)))  # Sunday
+        self.assertFalse(self.calendar.isWeekend(date(2024, 7, 4)))  # Thursday
+
+        # Holidays are not weekends
+        self.assertFalse(self.calendar.isWeekend(date(2024, 7, 23)))
+
+        # Test boundaries of the valid range
+        self.assertFalse(self.calendar.isWeekend(date(2020, 1, 1)))  # Wednesday
+        self.assertTrue(self.calendar.isWeekend(date(2056, 12, 31)))  # Sunday
+        with self.assertRaises(ValueError):
+            self.calendar.isWeekend(date(2057, 1, 1))
+
+    def test_addRemoveHoliday(self):
+        closure = date(2024, 7, 3)  # Wednesday
+        july = self.calendar.numBusinessDaysBetween(date(2024, 7, 1), date(2024, 7, 31))
+        self.assertEqual(self.calendar.addBusinessDays(date(2024, 7, 2), 1), closure)
+        self.calendar.addHoliday(closure, "Storm closure", "za")
+        self.assertEqual(self.calendar.version, 1)
+        self.assertFalse(self.calendar.isBusinessDay(closure))
+        self.assertEqual(self.calendar.addBusinessDays(date(2024, 7, 2), 1), date(2024, 7, 4))
+        self.assertEqual(self.calendar.addBusinessDays(closure, 0, "f"), date(2024, 7, 4))
+        self.assertEqual(self.calendar.addBusinessDays(closure, 0, "p"), date(2024, 7, 2))
+        self.assertEqual(self.calendar.addTenor(date(2024, 6, 3), "1m", "p", False), date(2024, 7, 2))
+        self.assertEqual(self.calendar.numBusinessDaysBetween(date(2024, 7, 1), date(2024, 7, 31)), july - 1)
+        self.assertIn("Storm closure", self.calendar.getHolidaysData(closure, closure)["name"].tolist())
+
+        # Other calendars built from the same cached masks are unaffected
+        self.assertTrue(Calendar.Calendar("ZA").isBusinessDay(closure))
+
+        self.calendar.removeHoliday(closure, "ZA")
+        self.assertEqual(self.calendar.version, 2)
+        self.assertTrue(self.calendar.isBusinessDay(closure))
+        self.assertEqual(self.calendar.addBusinessDays(date(2024, 7, 2), 1), closure)
+        self.assertEqual(self.calendar.numBusinessDaysBetween(date(2024, 7, 1), date(2024, 7, 31)), july)
+        self.assertTrue(self.calendar.getHolidaysData(closure, closure).empty)
+
+        # Removing an EG holiday on an EG weekend day leaves it closed
+        dates = np.arange(np.datetime64("2020-01-01"), np.datetime64("2057-01-01"))
+        expected = self.calendar.isBusinessDayArray(dates)
+        self.calendar.addHoliday(date(2024, 7, 5), "Extra", "EG")
+        self.calendar.removeHoliday(date(2024, 7, 5), "EG")
+        self.assertEqual(self.calendar.isBusinessDayArray(dates).tolist(), expected.tolist())
+
+        with self.assertRaises(ValueError):
+            self.calendar.removeHoliday(closure, "ZA")
+        with self.assertRaises(ValueError):
+            self.calendar.addHoliday(closure, "Closure", "US")
+        with self.assertRaises(ValueError):
+            self.calendar.addHoliday(date(2057, 1, 1), "Closure", "ZA")
+
+    def test_snapshot(self):
+        from concurrent.futures import ThreadPoolExecutor
+        snapshot = self.calendar.snapshot()
+        self.assertTrue(snapshot.frozen)
+        self.assertFalse(self.calendar.frozen)
+        self.assertIs(snapshot.snapshot(), snapshot)
+        self.assertTrue(np.shares_memory(snapshot._businessDayMask, self.calendar._businessDayMask))
+        with self.assertRaises(ValueError):
+            snapshot.addHoliday(date(2024, 7, 3), "Closure", "ZA")
+        with self.assertRaises(AttributeError):
+            snapshot.join = "all-closed"
+
+        # Patching the live calendar leaves the snapshot unchanged
+        self.calendar.addHoliday(date(2024, 7, 3), "Closure", "ZA")
+        self.assertFalse(self.calendar.isBusinessDay(date(2024, 7, 3)))
+        self.assertTrue(snapshot.isBusinessDay(date(2024, 7, 3)))
+        self.assertEqual(snapshot.version, 0)
+
+        # Concurrent queries on a shared snapshot agree with serial ones
+        starts = [date(2024, 1, 1) + timedelta(days=i) for i in range(200)]
+        expected = [snapshot.addBusinessDays(start, 10) for start in starts]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            self.assertEqual(list(executor.map(lambda start: snapshot.addBusinessDays(start, 10), starts)), expected)
+
+    def test_retrievalDatetime(self):
+        # Each calendar keeps the extraction timestamp of its own holiday data
+        self.assertIsNotNone(self.calendar.retrievalDatetime)
+        self.assertIn("ZA", self.calendar.availableCountries)
+        Calendar.Calendar("US")
+        self.assertEqual(self.calendar.retrievalDatetime, Calendar.Calendar("ZA+EG").retrievalDatetime)
+        self.assertIsNone(Calendar.Calendar.retrievalDatetime)
+
+    def test_join(self):
+        # With "all-closed" a day is closed only if both ZA and EG are closed
+        calendar = Calendar.Calendar("za+EG", join="all-closed")
+        self.assertTrue(calendar.isBusinessDay(date(2024, 7, 5)))  # Friday, open in ZA
+        self.assertFalse(calendar.isBusinessDay(date(2024, 7, 6)))  # Saturday, closed in both
+        self.assertTrue(calendar.isBusinessDay(date(2024, 7, 7)))  # Sunday, open in EG
+        self.assertTrue(calendar.isBusinessDay(date(2024, 7, 23)))  # EG holiday, open in ZA
+        self.assertFalse(calendar.isWeekend(date(2024, 7, 5)))
+        self.assertTrue(calendar.isWeekend(date(2024, 7, 6)))
+        self.assertEqual(calendar.addBusinessDays(date(2024, 7, 5), 1), date(2024, 7, 7))
+
+        # Joint calendars agree with combining the single-country calendars
+        dates = np.arange(np.datetime64("2020-01-01"), np.datetime64("2057-01-01"))
+        za, eg = Calendar.Calendar("ZA").isBusinessDayArray(dates), Calendar.Calendar("EG").isBusinessDayArray(dates)
+        self.assertEqual(self.calendar.isBusinessDayArray(dates).tolist(), (za & eg).tolist())
+        self.assertEqual(calendar.isBusinessDayArray(dates).tolist(), (za | eg).tolist())
+
+        self.assertIsNot(Calendar.Calendar.get("ZA+EG", join="ALL-CLOSED"), Calendar.Calendar.get("ZA+EG"))
+        with self.assertRaises(ValueError):
+            Calendar.Calendar("ZA+EG", join="all-open")
+
+    def test_isBusinessDayArray(self):
+        # Array results match the scalar methods over a full year
+        dates = np.arange(np.datetime64("2024-01-01"), np.datetime64("2025-01-01"))
+        expected = [self.calendar.isBusinessDay(d) for d in dates.astype(object)]
+        self.assertEqual(self.calendar.isBusinessDayArray(dates).tolist(), expected)
+        expected = [self.calendar.isWeekend(d) for d in dates.astype(object)]
+        self.assertEqual(self.calendar.isWeekendArray(dates).tolist(), expected)
+
+        # Lists of dates and pandas Series are accepted
+        given_dates = [date(2024, 7, 5), date(2024, 7, 8), date(2024, 7, 23)]
+        self.assertEqual(self.calendar.isBusinessDayArray(given_dates).tolist(), [False, True, False])
+        self.assertEqual(self.calendar.isWeekendArray(pd.Series(given_dates)).tolist(), [True, False, False])
+
+        # Test dates out of range
+        with self.assertRaises(ValueError):
+            self.calendar.isBusinessDayArray([date(2024, 7, 1), date(2057, 1, 1)])
+        with self.assertRaises(ValueError):
+            self.calendar.isWeekendArray(np.array(["2019-12-31"], dtype="datetime64[D]"))
+
 
     def test_getHolidaysData(self):
             # Test for holidays within a given date range
@@ -86,6 +384,25 @@ class TestCalendar(unittest.TestCase):
             with self.assertRaises(ValueError):
                 self.calendar.getHolidaysData(start_date, end_date)
 
+    def test_getHolidays(self):
+        # The lightweight results match the DataFrame, sorted by date
+        holidays = self.calendar.getHolidays(date(2024, 1, 1), date(2024, 12, 31))
+        frame = self.calendar.getHolidaysData(date(2024, 1, 1), date(2024, 12, 31))
+        self.assertEqual(sorted(holidays), sorted(map(tuple, frame.values.tolist())))
+        self.assertEqual([holiday[0] for holiday in holidays], sorted(frame["date"]))
+        self.assertIn(date(2024, 7, 23), [holiday[0] for holiday in holidays if holiday[2] == "EG"])
+
+        dates, names, countryCodes = self.calendar.getHolidays(date(2024, 7, 1), date(2024, 7, 31), asArrays=True)
+        self.assertEqual(dates.tolist(), [date(2024, 7, 23)])
+        self.assertEqual(countryCodes.tolist(), ["EG"])
+        self.assertEqual(self.calendar.getHolidays(date(2024, 7, 24), date(2024, 7, 31)), ())
+
+        # Added holidays are picked up
+        self.calendar.addHoliday(date(2024, 7, 24), "Closure", "ZA")
+        self.assertEqual(self.calendar.getHolidays(date(2024, 7, 24), date(2024, 7, 31)), ((date(2024, 7, 24), "Closure", "ZA"),))
+        with self.assertRaises(ValueError):
+            self.calendar.getHolidays(date(2024, 8, 31), date(2024, 8, 1))
+
 
     def test_addBusinessDays(self):
         # Test adding 3 business days to a Wednesday
@@ -122,6 +439,26 @@ class TestCalendar(unittest.TestCase):
         expected_date = date(2024, 6, 3)  # Next business day after adding 1 business day
         self.assertEqual(self.calendar.addBusinessDays(start_date, 0, "mp"), expected_date)
 
+    def test_addBusinessDaysArray(self):
+        # Array results match the scalar method for every roll convention
+        start_dates = np.arange(np.datetime64("2024-05-20"), np.datetime64("2024-08-10"))
+        offsets = np.arange(len(start_dates)) % 11 - 5
+        for roll in (None, "f", "p", "mf", "mp"):
+            result = self.calendar.addBusinessDaysArray(start_dates, offsets, roll)
+            self.assertEqual(result.dtype, np.dtype("datetime64[D]"))
+            expected = [self.calendar.addBusinessDays(d, int(n), roll) for d, n in zip(start_dates.astype(object), offsets)]
+            self.assertEqual(result.astype(object).tolist(), expected)
+
+        # A single offset applies to every start date
+        result = self.calendar.addBusinessDaysArray([date(2024, 7, 3), date(2024, 7, 5)], 3)
+        self.assertEqual(result.astype(object).tolist(), [date(2024, 7, 9), date(2024, 7, 10)])
+
+        # Test invalid roll type and stepping past the valid range
+        with self.assertRaises(ValueError):
+            self.calendar.addBusinessDaysArray([date(2024, 7, 1)], 3, "invalid_roll_type")
+        with self.assertRaises(ValueError):
+            self.calendar.addBusinessDaysArray([date(2024, 7, 1), date(2056, 12, 20)], 30)
+
     def test_getLastBusinessDateInMonth(self):
         # Test for June 2024 (30th is a Sunday)
         given_date = date(2024, 6, 30)
@@ -143,6 +480,34 @@ class TestCalendar(unittest.TestCase):
         last_business_day = self.calendar.getLastBusinessDateInMonth(given_date)
         self.assertEqual(last_business_day, date(2023, 2, 28))  # Last business day in February 2023
 
+    def test_monthTables(self):
+        self.assertEqual(self.calendar.getFirstBusinessDateInMonth(date(2024, 7, 15)), date(2024, 7, 1))
+        self.assertEqual(self.calendar.getFirstBusinessDateInMonth(date(2024, 6, 15)), date(2024, 6, 3))
+        self.assertEqual(self.calendar.getNthBusinessDateInMonth(date(2024, 7, 15), 2), date(2024, 7, 2))
+        self.assertEqual(self.calendar.getNthBusinessDateInMonth(date(2024, 7, 15), -1), date(2024, 7, 31))
+        self.assertEqual(self.calendar.getNthBusinessDateInMonth(date(2024, 7, 15), -2), date(2024, 7, 30))
+        with self.assertRaises(ValueError):
+            self.calendar.getNthBusinessDateInMonth(date(2024, 7, 15), 0)
+        with self.assertRaises(ValueError):
+            self.calendar.getNthBusinessDateInMonth(date(2024, 7, 15), 25)
+
+        # The array versions agree with the scalar lookups
+        dates = np.arange(np.datetime64("2024-01-01"), np.datetime64("2025-01-01"))
+        last = self.calendar.getLastBusinessDateInMonthArray(dates)
+        first = self.calendar.getFirstBusinessDateInMonthArray(dates)
+        isLast = self.calendar.isLastBusinessDayInMonthArray(dates)
+        for i, day in enumerate(dates.astype(object)):
+            self.assertEqual(last[i], self.calendar.getLastBusinessDateInMonth(day))
+            self.assertEqual(first[i], self.calendar.getFirstBusinessDateInMonth(day))
+            self.assertEqual(isLast[i], self.calendar.isLastBusinessDayInMonth(day))
+        self.assertEqual(self.calendar.getNthBusinessDateInMonthArray(["2024-07-15", "2024-07-01"], [2, -1]).tolist(),
+                         [date(2024, 7, 2), date(2024, 7, 31)])
+
+        # The tables follow added holidays
+        self.calendar.addHoliday(date(2024, 7, 31), "Closure", "ZA")
+        self.assertEqual(self.calendar.getLastBusinessDateInMonth(date(2024, 7, 1)), date(2024, 7, 30))
+        self.assertTrue(self.calendar.isLastBusinessDayInMonth(date(2024, 7, 30)))
+
 
 
     def test_numBusinessDaysBetween(self):
@@ -158,6 +523,48 @@ class TestCalendar(unittest.TestCase):
         business_days_count = self.calendar.numBusinessDaysBetween(start_date, end_date)
         self.assertEqual(business_days_count, 17)
 
+        # Test omitted end date counts up to the end of the valid range
+        start_date = date(2056, 12, 1)
+        self.assertEqual(self.calendar.numBusinessDaysBetween(start_date, None),
+                         self.calendar.numBusinessDaysBetween(start_date, date(2056, 12, 31)))
+
+    def test_numBusinessDaysBetweenArray(self):
+        # Array results match the scalar method for every endpoint option, including one-day periods
+        starts = np.array(["2024-07-01", "2024-07-05", "2024-07-05", "2024-12-20", "2020-01-01"], dtype="datetime64[D]")
+        ends = np.array(["2024-07-31", "2024-07-05", "2024-07-08", "2025-01-10", "2056-12-31"], dtype="datetime64[D]")
+        for inclusive in ("both", "left", "right", "neither"):
+            expected = [self.calendar.numBusinessDaysBetween(start, end, inclusive)
+                        for start, end in zip(starts.astype(object), ends.astype(object))]
+            result = self.calendar.numBusinessDaysBetweenArray(starts, ends, inclusive)
+            self.assertEqual(result.tolist(), expected)
+        self.assertEqual(self.calendar.numBusinessDaysBetween(date(2024, 7, 1), date(2024, 7, 31), "neither"), 16)
+        self.assertEqual(self.calendar.numBusinessDaysBetween(date(2024, 7, 1), date(2024, 7, 1), "left"), 0)
+
+        # Omitted end dates count up to the end of the valid range
+        self.assertEqual(self.calendar.numBusinessDaysBetweenArray([date(2056, 12, 1)]).tolist(),
+                         [self.calendar.numBusinessDaysBetween(date(2056, 12, 1), None)])
+
+        with self.assertRaises(ValueError):
+            self.calendar.numBusinessDaysBetweenArray(ends, starts)
+        with self.assertRaises(ValueError):
+            self.calendar.numBusinessDaysBetweenArray(starts, ends, "open")
+        with self.assertRaises(ValueError):
+            self.calendar.numBusinessDaysBetweenArray([date(2024, 7, 1)], [date(2057, 1, 1)])
+
+    def test_businessDayCountsConsistency(self):
+        # Adding N business days to a business day spans N + 1 business days, and subtracting N returns to it
+        start_date = date(2024, 7, 1)
+        for n in (1, 5, 20, 250, 2500):
+            end_date = self.calendar.addBusinessDays(start_date, n)
+            self.assertEqual(self.calendar.numBusinessDaysBetween(start_date, end_date), n + 1)
+            self.assertEqual(self.calendar.addBusinessDays(end_date, -n), start_date)
+
+        # Test stepping past the valid range
+        with self.assertRaises(ValueError):
+            self.calendar.addBusinessDays(date(2056, 12, 20), 30)
+        with self.assertRaises(ValueError):
+            self.calendar.addBusinessDays(date(2020, 1, 10), -30)
+
     def test_addTenor(self):
         # Test adding 1 day
         start_date = date(2024, 6, 27)
@@ -222,6 +629,69 @@ class TestCalendar(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.calendar.addTenor(start_date, "2x", "f", False)
 
+    def test_addTenorArray(self):
+        # Array results match the scalar method for every roll, tenor and month-end setting
+        start_dates = np.arange(np.datetime64("2024-01-20"), np.datetime64("2024-04-05"))
+        tenors = np.array(["1d", "-1d", "2w", "1m", "-2m", "1y", "3M"])[np.arange(len(start_dates)) % 7]
+        for roll in ("f", "p", "mf", "mp"):
+            for preserve_month_end in (True, False):
+                result = self.calendar.addTenorArray(start_dates, tenors, roll, preserve_month_end)
+                expected = [self.calendar.addTenor(d, t, roll, preserve_month_end)
+                            for d, t in zip(start_dates.astype(object), tenors)]
+                self.assertEqual(result.astype(object).tolist(), expected)
+
+        # A single tenor applies to every start date
+        result = self.calendar.addTenorArray([date(2024, 3, 28), date(2024, 6, 15)], "1m", "f", True)
+        self.assertEqual(result.astype(object).tolist(), [date(2024, 4, 30), date(2024, 7, 15)])
+
+        # Test invalid roll type and tenor format
+        with self.assertRaises(ValueError):
+            self.calendar.addTenorArray([date(2024, 6, 15)], "1m", "invalid", False)
+        with self.assertRaises(ValueError):
+            self.calendar.addTenorArray([date(2024, 6, 15)], ["2x"], "f", False)
+
+    def test_generateSchedule(self):
+        start_date = date(2024, 1, 15)
+        end_date = date(2025, 3, 31)
+
+        # Front stub, generated backwards from the end date
+        unadjusted, adjusted = self.calendar.generateSchedule(start_date, end_date, "3M", "mf", False)
+        self.assertEqual(unadjusted.astype(object).tolist(),
+                         [date(2024, 1, 15), date(2024, 3, 31), date(2024, 6, 30), date(2024, 9, 30),
+                          date(2024, 12, 31), date(2025, 3, 31)])
+        expected = [self.calendar.addTenor(end_date, f"-{3 * k}m", "mf", False) for k in range(4, -1, -1)]
+        self.assertEqual(adjusted.astype(object).tolist()[1:], expected)
+
+        # Long front stub merges the stub with the first regular period
+        unadjusted, adjusted = self.calendar.generateSchedule(start_date, end_date, "3M", "mf", False, longStub=True)
+        self.assertEqual(unadjusted.astype(object).tolist()[:2], [date(2024, 1, 15), date(2024, 6, 30)])
+
+        # Back stub, generated forwards from the start date
+        unadjusted, adjusted = self.calendar.generateSchedule(date(2024, 1, 31), date(2024, 5, 15), "1m", "f", False, "back")
+        self.assertEqual(unadjusted.astype(object).tolist(),
+                         [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30), date(2024, 5, 15)])
+        unadjusted, adjusted = self.calendar.generateSchedule(date(2024, 1, 31), date(2024, 5, 15), "1m", "f", False, "back", True)
+        self.assertEqual(unadjusted.astype(object).tolist(),
+                         [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 5, 15)])
+
+        # Many schedules at once match the individual schedules
+        start_dates = [date(2024, 1, 1), date(2024, 2, 1)]
+        end_dates = [date(2026, 1, 1), date(2024, 3, 1)]
+        unadjusted, adjusted, offsets = self.calendar.generateSchedules(start_dates, end_dates, "6M", "mf", True)
+        self.assertEqual(offsets.tolist(), [0, 5, 7])
+        for i in range(2):
+            single_unadjusted, single_adjusted = self.calendar.generateSchedule(start_dates[i], end_dates[i], "6M", "mf", True)
+            self.assertEqual(unadjusted[offsets[i]:offsets[i + 1]].tolist(), single_unadjusted.tolist())
+            self.assertEqual(adjusted[offsets[i]:offsets[i + 1]].tolist(), single_adjusted.tolist())
+
+        # Test invalid arguments
+        with self.assertRaises(ValueError):
+            self.calendar.generateSchedule(end_date, start_date, "3M", "mf", False)
+        with self.assertRaises(ValueError):
+            self.calendar.generateSchedule(start_date, end_date, "-3M", "mf", False)
+        with self.assertRaises(ValueError):
+            self.calendar.generateSchedule(start_date, end_date, "3M", "mf", False, "middle")
+
 
 
 if __name__ == "__main__":
@@ -9,11 +9,15 @@ import unittest
 import sys
 import os
 from datetime import date
+import numpy as np
 
 # Ensure the code directory is in the sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'code')))
 
 from DayCountBasis import DayCountBasis, DayCountConvention
+from Date import Date
+from Calendar import Calendar
+from HolidayRules import RuleHolidaySource
 #from myCalendar import Calendar
 
 class TestDayCountBasis(unittest.TestCase):
@@ -85,5 +89,126 @@ class TestDayCountBasis(unittest.TestCase):
         with self.assertRaises(ValueError):
             dcb.dayCountFraction(start_date, end_date)
 
+    def test_dayCountFractionArray(self):
+        # Array results are bit-identical to the scalar method for every basis
+        start_dates = [date(2023, 4, 20), date(2024, 1, 31), date(2024, 2, 29), date(2023, 12, 31), date(2024, 3, 30)]
+        end_dates = [date(2026, 5, 31), date(2024, 3, 31), date(2025, 2, 28), date(2024, 12, 31), date(2024, 3, 31)]
+        for basis in ['act/365', 'act/360', 'act/act', '30/360', '30/360e', '30/360ee']:
+            dcb = DayCountBasis(basis)
+            fractions = dcb.dayCountFractionArray(np.array(start_dates, dtype="datetime64[D]"), end_dates)
+            expected = [dcb.dayCountFraction(Date(s.year, s.month, s.day), Date(e.year, e.month, e.day))
+                        for s, e in zip(start_dates, end_dates)]
+            self.assertEqual(fractions.dtype, np.float64)
+            self.assertEqual(fractions.tolist(), expected)
+
+        dcb = DayCountBasis('act/365')
+        with self.assertRaises(ValueError):
+            dcb.dayCountFractionArray([date(2024, 1, 1)], [date(2023, 1, 1)])
+        with self.assertRaises(ValueError):
+            dcb.dayCountFractionArray([date(2024, 1, 1)], [date(2057, 1, 1)])
+
+    def test_act_act_variants(self):
+        start_date, end_date = date(2023, 11, 1), date(2024, 5, 1)
+        # ISDA splits the days by year; plain dates work as well as Date objects
+        self.assertEqual(DayCountBasis('act/act isda').dayCountFraction(start_date, end_date), 61 / 365 + 121 / 366)
+        self.assertEqual(DayCountBasis('act/act').dayCountFraction(start_date, end_date), 61 / 365 + 121 / 366)
+        # ICMA divides by the days of the reference period times the coupon frequency
+        icma = DayCountBasis('act/act icma')
+        self.assertEqual(icma.dayCountFraction(start_date, end_date, start_date, end_date, 2), 0.5)
+        self.assertEqual(icma.dayCountFraction(date(2024, 2, 1), end_date, start_date, end_date, 2), 90 / 364)
+        # AFB counts whole years back from the end date and uses 366 if the rest contains 29 February
+        afb = DayCountBasis('act/act afb')
+        self.assertEqual(afb.dayCountFraction(start_date, end_date), 182 / 366)
+        self.assertEqual(afb.dayCountFraction(date(2020, 2, 29), date(2024, 2, 28)), 4.0)
+        self.assertEqual(afb.dayCountFraction(date(2022, 3, 1), date(2024, 6, 1)), 2 + 92 / 365)
+
+        start_dates = np.array(["2023-11-01", "2020-02-29", "2022-03-01"], dtype="datetime64[D]")
+        end_dates = np.array(["2024-05-01", "2024-02-28", "2024-06-01"], dtype="datetime64[D]")
+        for basis in ['act/act isda', 'act/act afb']:
+            dcb = DayCountBasis(basis)
+            self.assertEqual(dcb.dayCountFractionArray(start_dates, end_dates).tolist(),
+                             [dcb.dayCountFraction(s, e) for s, e in zip(start_dates.astype(object), end_dates.astype(object))])
+        self.assertEqual(icma.dayCountFractionArray(start_dates[:1], end_dates[:1], start_dates[:1], end_dates[:1], 2).tolist(), [0.5])
+
+        with self.assertRaises(ValueError):
+            icma.dayCountFraction(start_date, end_date)
+        with self.assertRaises(ValueError):
+            icma.dayCountFraction(start_date, date(2024, 5, 2), start_date, end_date, 2)
+        with self.assertRaises(ValueError):
+            icma.dayCountFractionArray(start_dates, end_dates, start_dates, end_dates, 0)
+
+    def test_scheduleFractions(self):
+        dates = np.array(["2024-01-31", "2024-04-30", "2024-07-31", "2024-10-31", "2025-01-31"], dtype="datetime64[D]")
+        for basis in ['act/365', 'act/act', 'act/act afb', '30/360', '30/360ee']:
+            dcb = DayCountBasis(basis)
+            expected = [dcb.dayCountFraction(s, e) for s, e in zip(dates[:-1].astype(object), dates[1:].astype(object))]
+            self.assertEqual(dcb.scheduleFractions(dates).tolist(), expected)
+        # Each regular ICMA period is its own reference period unless reference periods are given
+        icma = DayCountBasis('act/act icma')
+        self.assertEqual(icma.scheduleFractions(dates, frequency=4).tolist(), [0.25] * 4)
+        self.assertEqual(icma.scheduleFractions(dates, frequency=4, stub="back").tolist(), [0.25] * 4)
+
+        # Stubs are measured against notional regular periods counted from their inner end
+        calendar = Calendar("ZA", holidaySource=RuleHolidaySource.default())
+        unadjusted, adjusted = calendar.generateSchedule(date(2024, 2, 15), date(2025, 6, 30), "6M", "mf", False)
+        self.assertEqual(unadjusted.tolist(), [date(2024, 2, 15), date(2024, 6, 30), date(2024, 12, 30), date(2025, 6, 30)])
+        # 2024-02-15 to 2024-06-30 in the reference period 2023-12-31 to 2024-06-30
+        self.assertEqual(icma.scheduleFractions(unadjusted, frequency=2).tolist(), [136 / (2 * 182), 0.5, 0.5])
+        # Adjusted, 2024-02-15 to 2024-06-28 in the reference period 2023-12-28 to 2024-06-28
+        self.assertEqual(icma.scheduleFractions(adjusted, frequency=2).tolist(), [134 / (2 * 183), 0.5, 0.5])
+        # A long front stub spans two notional periods, 2023-12-30 to 2024-06-30 and 2024-06-30 to 2024-12-30
+        unadjusted, adjusted = calendar.generateSchedule(date(2024, 2, 15), date(2025, 6, 30), "6M", "mf", False, longStub=True)
+        self.assertEqual(icma.scheduleFractions(unadjusted, frequency=2).tolist(), [136 / (2 * 183) + 183 / (2 * 183), 0.5])
+        # A back stub is measured forwards from its start, 2025-01-15 to 2025-07-15
+        unadjusted, adjusted = calendar.generateSchedule(date(2024, 1, 15), date(2025, 2, 15), "6M", "mf", False, "back")
+        self.assertEqual(icma.scheduleFractions(unadjusted, frequency=2, stub="back").tolist(), [0.5, 0.5, 31 / (2 * 181)])
+        with self.assertRaises(ValueError):
+            icma.scheduleFractions(unadjusted, frequency=5)
+        with self.assertRaises(ValueError):
+            icma.scheduleFractions(unadjusted, frequency=2, stub="middle")
+
+        # Ragged schedules are padded and masked; periods next to padding are NaN
+        dcb = DayCountBasis('30/360')
+        schedules = np.array([dates, np.concatenate((dates[:3], np.full(2, np.datetime64("NaT", "D"))))])
+        mask = ~np.isnat(schedules)
+        fractions = dcb.scheduleFractions(schedules, mask)
+        self.assertEqual(fractions.shape, (2, 4))
+        self.assertEqual(fractions[0].tolist(), [0.25] * 4)
+        self.assertEqual(fractions[1, :2].tolist(), [0.25] * 2)
+        self.assertTrue(np.isnan(fractions[1, 2:]).all())
+
+        with self.assertRaises(ValueError):
+            dcb.scheduleFractions(dates[::-1])
+        with self.assertRaises(ValueError):
+            dcb.scheduleFractions(schedules)
+
+    def test_bus_252(self):
+        calendar = Calendar("ZA", holidaySource=RuleHolidaySource.default())
+        dcb = DayCountBasis('bus/252', calendar)
+        # June 2024 has 20 weekdays, and Youth Day (Sunday the 16th) is observed on Monday the 17th
+        self.assertEqual(dcb.dayCountFraction(date(2024, 6, 1), date(2024, 7, 1)), 19 / 252.0)
+        self.assertEqual(dcb.dayCountFraction(date(2024, 6, 3), date(2024, 6, 3)), 0.0)
+        start_dates = np.array(["2024-06-01", "2024-06-14", "2020-01-01"], dtype="datetime64[D]")
+        end_dates = np.array(["2024-07-01", "2024-06-18", "2056-12-31"], dtype="datetime64[D]")
+        expected = [dcb.dayCountFraction(s, e) for s, e in zip(start_dates.astype(object), end_dates.astype(object))]
+        self.assertEqual(dcb.dayCountFractionArray(start_dates, end_dates).tolist(), expected)
+        self.assertEqual(expected[1], 1 / 252.0)  # Only Friday the 14th
+
+        # Dates are validated against the calendar's own range, not the default one
+        longCalendar = Calendar("ZA", holidaySource=RuleHolidaySource.default(), validDateRange=(date(2020, 1, 1), date(2090, 12, 31)))
+        longDcb = DayCountBasis('bus/252', longCalendar)
+        start, end = date(2060, 1, 1), date(2061, 1, 1)
+        expected = longCalendar.numBusinessDaysBetween(start, end, "left") / 252.0
+        self.assertEqual(longDcb.dayCountFraction(start, end), expected)
+        self.assertEqual(longDcb.dayCountFractionArray([start], [end]).tolist(), [expected])
+        self.assertEqual(longDcb.scheduleFractions([start, end]).tolist(), [expected])
+        with self.assertRaises(ValueError):
+            longDcb.dayCountFraction(date(2060, 1, 1), date(2091, 1, 1))
+        with self.assertRaises(ValueError):
+            dcb.dayCountFractionArray([start], [end])
+
+        with self.assertRaises(ValueError):
+            DayCountBasis('bus/252')
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+from datetime import date
+import sys
+import os
+import gc
+import weakref
+
+# Ensure the code directory is in the sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'code')))
+
+from HolidayRules import (RuleHolidaySource, HolidayRule, FixedDateRule, NthWeekdayRule, EasterRule, easterSunday,
+                          SUNDAY_TO_MONDAY, FOLLOWING_WEEKDAY)
+from Calendar import Calendar
+
+
+class TestHolidayRules(unittest.TestCase):
+    def test_easterSunday(self):
+        self.assertEqual(easterSunday(2024), date(2024, 3, 31))
+        self.assertEqual(easterSunday(2025), date(2025, 4, 20))
+        self.assertEqual(easterSunday(2038), date(2038, 4, 25))
+        self.assertEqual(easterSunday(2285), date(2285, 3, 22))
+
+    def test_rules(self):
+        self.assertEqual(FixedDateRule(6, 16, "Youth Day").date(2024), date(2024, 6, 16))
+        self.assertEqual(NthWeekdayRule(11, 3, 4, "Thanksgiving Day").date(2024), date(2024, 11, 28))
+        self.assertEqual(NthWeekdayRule(5, 0, -1, "Memorial Day").date(2024), date(2024, 5, 27))
+        self.assertEqual(NthWeekdayRule(12, 4, -1, "Last Friday").date(2024), date(2024, 12, 27))
+        self.assertEqual(EasterRule(-2, "Good Friday").date(2024), date(2024, 3, 29))
+        with self.assertRaises(ValueError):
+            NthWeekdayRule(1, 0, 0, "Invalid")
+        with self.assertRaises(TypeError):
+            HolidayRule("Abstract")
+
+    def test_substitution(self):
+        source = RuleHolidaySource.default()
+        # Christmas 2022 is a Sunday and the Monday is already Day of Goodwill, so Tuesday is observed
+        self.assertIn((date(2022, 12, 27), "Christmas Day (observed)"), source.holidays("ZA", 2022))
+        # US New Year's Day 2022 is a Saturday and is observed on the Friday before
+        self.assertEqual(source.holidays("US", 2022)[0], (date(2021, 12, 31), "New Year's Day (observed)"))
+        self.assertIn((date(2021, 12, 31), "New Year's Day (observed)"), source.holidaysBetween("US", date(2021, 12, 1), date(2021, 12, 31)))
+        # Juneteenth only applies from 2021
+        self.assertNotIn("Juneteenth National Independence Day", [name for _, name in source.holidays("US", 2020)])
+
+        # Substituted days skip the country's weekend
+        source = RuleHolidaySource().addCountry("AE", [FixedDateRule(12, 2, "National Day", FOLLOWING_WEEKDAY)], weekendDays=(5, 6))
+        self.assertEqual(source.holidays("AE", 2023), ((date(2023, 12, 2), "National Day"), (date(2023, 12, 4), "National Day (observed)")))
+
+        # Rules falling on the same date keep their registration order
+        source = RuleHolidaySource().addCountry("XX", [EasterRule(0, "Easter"), FixedDateRule(4, 16, "Fixed")])
+        self.assertEqual(source.holidays("XX", 2028)[:2], ((date(2028, 4, 16), "Easter"), (date(2028, 4, 16), "Fixed")))
+
+    def test_memoization(self):
+        source = RuleHolidaySource().addCountry("ZA", [FixedDateRule(6, 16, "Youth Day", SUNDAY_TO_MONDAY)])
+        self.assertIs(source.holidays("ZA", 2024), source.holidays("ZA", 2024))
+        source.holidaysBetween("ZA", date(2030, 1, 1), date(2030, 12, 31))
+        self.assertEqual(sorted(year for _, year in source._years), [2024, 2029, 2030, 2031])
+
+
+class TestRuleCalendar(unittest.TestCase):
+    def test_calendar(self):
+        source = RuleHolidaySource.default()
+        calendar = Calendar("ZA+US", holidaySource=source, validDateRange=(date(2020, 1, 1), date(2080, 12, 31)))
+        self.assertEqual(calendar.countryCodes, ["ZA", "US"])
+        self.assertFalse(calendar.isBusinessDay(date(2075, 12, 25)))
+        self.assertFalse(calendar.isBusinessDay(date(2075, 12, 26)))  # Day of Goodwill in ZA
+        self.assertTrue(calendar.isBusinessDay(date(2075, 12, 27)))
+        self.assertEqual(calendar.addTenor(date(2025, 11, 28), "50y", "f", False), date(2075, 11, 29))  # Thanksgiving 2075 is the 28th
+        self.assertEqual(calendar.getHolidays(date(2075, 12, 20), date(2075, 12, 31)),
+                         ((date(2075, 12, 25), "Christmas Day", "ZA"), (date(2075, 12, 25), "Christmas Day", "US"),
+                          (date(2075, 12, 26), "Day of Goodwill", "ZA")))
+        with self.assertRaises(ValueError):
+            calendar.isBusinessDay(date(2081, 1, 1))
+
+        # The custom range only applies to this calendar
+        self.assertEqual(Calendar.validDateRange, (date(2020, 1, 1), date(2056, 12, 31)))
+        with self.assertRaises(ValueError):
+            Calendar("ZA", validDateRange=(date(2020, 1, 1), date(2080, 12, 31)))
+        with self.assertRaises(ValueError):
+            Calendar("GB", holidaySource=source)
+        # Custom ranges are built in full, so their length is bounded
+        with self.assertRaises(ValueError):
+            Calendar("ZA", holidaySource=source, validDateRange=(date(2020, 1, 1), date(2220, 1, 1)))
+        self.assertTrue(Calendar("ZA", holidaySource=source, validDateRange=(date(2020, 1, 1), date(2219, 12, 31))).isBusinessDay(date(2219, 12, 30)))
+
+    def test_maskCache(self):
+        # Masks are cached per source: calendars on different sources do not evict each other
+        first = RuleHolidaySource().addCountry("XX", [FixedDateRule(7, 1, "A")])
+        second = RuleHolidaySource().addCountry("XX", [FixedDateRule(7, 2, "B")])
+        Calendar("XX", holidaySource=first)
+        Calendar("XX", holidaySource=second)
+        self.assertIs(Calendar("XX", holidaySource=first)._countryBusinessDayMasks["XX"],
+                      Calendar("XX", holidaySource=first)._countryBusinessDayMasks["XX"])
+        self.assertFalse(Calendar("XX", holidaySource=first).isBusinessDay(date(2024, 7, 1)))
+        self.assertFalse(Calendar("XX", holidaySource=second).isBusinessDay(date(2024, 7, 2)))
+
+        # The cache neither keeps sources alive nor grows past its size
+        reference = weakref.ref(first)
+        del first
+        gc.collect()
+        self.assertIsNone(reference())
+        for _ in range(Calendar.countryMaskCacheSize + 1):
+            Calendar("XX", holidaySource=RuleHolidaySource().addCountry("XX", [FixedDateRule(7, 1, "A")]))
+        self.assertEqual(len(Calendar._countryMaskCache), Calendar.countryMaskCacheSize)
+
+    def test_reregisterCountry(self):
+        # Re-registering a country's rules or weekend days is picked up by calendars built afterwards
+        source = RuleHolidaySource().addCountry("XX", [FixedDateRule(7, 1, "A")])
+        self.assertFalse(Calendar("XX", holidaySource=source).isBusinessDay(date(2024, 7, 1)))
+        source.addCountry("XX", [FixedDateRule(7, 2, "B")], weekendDays=(4,))
+        calendar = Calendar("XX", holidaySource=source)
+        self.assertTrue(calendar.isBusinessDay(date(2024, 7, 1)))
+        self.assertFalse(calendar.isBusinessDay(date(2024, 7, 2)))
+        self.assertTrue(calendar.isBusinessDay(date(2024, 7, 6)))  # Saturday
+        self.assertFalse(calendar.isBusinessDay(date(2024, 7, 5)))  # Friday
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import sys
+import os
+import subprocess
+
+
+class TestImports(unittest.TestCase):
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    codeDirectory = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'code'))
+
+    def runScript(self, script, cwd):
+        result = subprocess.run([sys.executable, "-c", script], cwd=cwd, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_flatImportsWithoutNumPy(self):
+        # DayCountBasis, Rate and Date import without NumPy or pandas
+        self.runScript("""
+import sys
+import DayCountBasis, Rate, Date
+assert "numpy" not in sys.modules and "pandas" not in sys.modules, [m for m in ("numpy", "pandas") if m in sys.modules]
+""", self.codeDirectory)
+
+    def test_packageImports(self):
+        # The package loads submodules lazily, and they import through the package without sys.path changes
+        self.runScript("""
+import sys
+from datetime import date
+import myLib.code
+assert "myLib.code.Calendar" not in sys.modules
+import myLib.code.Rate, myLib.code.DayCountBasis, myLib.code.Date
+assert "numpy" not in sys.modules and "pandas" not in sys.modules, [m for m in ("numpy", "pandas") if m in sys.modules]
+assert myLib.code.DayCountBasis.DayCountBasis("act/365").dayCountFraction(date(2024, 1, 1), date(2025, 1, 1)) == 366 / 365
+""", self.root)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from datetime import date
+import sys
+import subprocess
+import os
+
+# Ensure the code directory is in the sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'code')))
+
+from Metrics import Metrics, enableMetrics, disableMetrics, instrument
+from HolidayRules import RuleHolidaySource
+from Calendar import Calendar
+from DayCountBasis import DayCountBasis
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.source = RuleHolidaySource.default()
+        self.calendar = Calendar("ZA", holidaySource=self.source)
+
+    def tearDown(self):
+        disableMetrics()
+        self.calendar.disableMetrics()
+
+    def test_disabled(self):
+        # No wrappers are installed while metrics are disabled
+        self.assertFalse(hasattr(Calendar.isBusinessDay, "__wrapped__"))
+        metrics = self.calendar.enableMetrics()
+        self.assertTrue(hasattr(Calendar.isBusinessDay, "__wrapped__"))
+        self.calendar.disableMetrics()
+        self.assertFalse(hasattr(Calendar.isBusinessDay, "__wrapped__"))
+        self.calendar.isBusinessDay(date(2024, 6, 17))
+        self.assertEqual(metrics.calls, {})
+
+    def test_calendarMetrics(self):
+        metrics = self.calendar.enableMetrics()
+        other = Calendar("US", holidaySource=self.source)
+        other.isBusinessDay(date(2024, 6, 17))
+
+        # Youth Day 2024 is a Sunday and is observed on Monday the 17th
+        self.assertEqual(self.calendar.addBusinessDays(date(2024, 6, 15), 3, "f"), date(2024, 6, 21))
+        self.assertTrue(self.calendar.isBusinessDay(date(2024, 6, 18)))
+        result = metrics.asDict()
+        self.assertEqual(result["calls"]["Calendar.addBusinessDays"]["count"], 1)
+        self.assertEqual(result["calls"]["Calendar.isBusinessDay"]["count"], 1)
+        self.assertGreater(result["calls"]["Calendar.addBusinessDays"]["time"], 0)
+        # The roll and the business-day step are table lookups, so no loop iterations are recorded
+        self.assertEqual(result["calls"]["Calendar._followingIndex"]["count"], 1)
+        self.assertEqual(result["loops"], {})
+        self.assertNotIn("Calendar.__init__", result["calls"])
+
+    def test_globalMetrics(self):
+        events = []
+        metrics = enableMetrics(Metrics(callback=lambda kind, name, value: events.append((kind, name))))
+        calendar = Calendar("ZA", holidaySource=self.source)
+        calendar.getHolidays(date(2024, 1, 1), date(2024, 12, 31))
+        calendar.getHolidays(date(2025, 1, 1), date(2025, 12, 31))
+        DayCountBasis("30/360").dayCountFraction(date(2024, 1, 31), date(2024, 7, 31))
+
+        self.assertEqual(metrics.calls["Calendar.__init__"], 1)
+        self.assertEqual(metrics.calls["DayCountBasis.thirty360"], 1)
+        # Once per getHolidays call, and three times for one 30/360 fraction
+        self.assertEqual(metrics.calls["Calendar.validateDateRange"], 5)
+        caches = metrics.cacheStats()
+        self.assertEqual(caches["Calendar._holidayIndex"], {"hits": 1, "misses": 1, "hitRatio": 0.5})
+        self.assertEqual(caches["Calendar._countryMasks"]["misses"], 0)
+        self.assertIn(("call", "DayCountBasis.dayCountFraction"), events)
+
+        metrics.reset()
+        self.assertEqual(metrics.asDict(), {"calls": {}, "loops": {}, "caches": {}})
+        self.assertIs(disableMetrics(), metrics)
+        self.assertFalse(hasattr(Calendar.isBusinessDay, "__wrapped__"))
+
+    def test_loopCounter(self):
+        # Loop iterations come from the loop counter a method is registered with
+        class Stepper:
+            def step(self, days):
+                return sum(1 for _ in range(days))
+
+        instrument(Stepper, {"step": lambda result, days: days})
+        metrics = enableMetrics()
+        Stepper().step(4)
+        Stepper().step(3)
+        self.assertEqual(metrics.loops, {"Stepper.step": 7})
+
+
+class TestPackageImports(unittest.TestCase):
+    def test_sharedModules(self):
+        # Imported through the package (without the code directory on sys.path), all modules share one
+        # Metrics and one Validation module
+        script = """
+import sys
+from datetime import date
+import myLib.code.Rate
+from myLib.code import Calendar, HolidayRules, Metrics, Validation
+calendar = Calendar.Calendar("ZA", holidaySource=HolidayRules.RuleHolidaySource.default())
+metrics = Metrics.enableMetrics()
+calendar.isBusinessDay(date(2024, 1, 2))
+assert metrics.calls == {"Calendar.isBusinessDay": 1}, metrics.calls
+with Validation.trusted([date(2024, 1, 2)]):
+    Calendar.Calendar.validateDateRange(date(2060, 1, 1))
+assert not {"Metrics", "Validation", "Calendar", "Rate"} & set(sys.modules)
+"""
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+        result = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+from datetime import date
+import sys
+import os
+import threading
+import numpy as np
+
+# Ensure the code directory is in the sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'code')))
+
+import Validation
+from Validation import trusted
+from HolidayRules import RuleHolidaySource
+from Calendar import Calendar
+from DayCountBasis import DayCountBasis
+from Rate import Rate, CompoundingFrequency, DayCountConvention
+
+
+class TestTrusted(unittest.TestCase):
+    def setUp(self):
+        self.calendar = Calendar("ZA+US", holidaySource=RuleHolidaySource.default())
+
+    def test_sameResults(self):
+        start_dates = np.array(["2024-01-31", "2024-06-14", "2030-12-24"], dtype="datetime64[D]")
+        end_dates = np.array(["2024-07-31", "2025-06-16", "2031-01-02"], dtype="datetime64[D]")
+        dcb = DayCountBasis('act/act')
+
+        def run():
+            return ([self.calendar.addTenor(d, "3m", "mf", True) for d in start_dates.astype(object)],
+                    [self.calendar.numBusinessDaysBetween(s, e) for s, e in zip(start_dates.astype(object), end_dates.astype(object))],
+                    [dcb.dayCountFraction(s, e) for s, e in zip(start_dates.astype(object), end_dates.astype(object))],
+                    Rate.equivalentRate(0.1, CompoundingFrequency.NACS, DayCountConvention.ACT_365,
+                                        CompoundingFrequency.NACC, DayCountConvention.ACT_360))
+
+        expected = run()
+        with trusted(start_dates, end_dates):
+            self.assertTrue(Validation.isTrusted())
+            self.assertEqual(run(), expected)
+            # The omitted end date still defaults to the end of the valid range
+            self.assertEqual(Calendar.validateDateRange(date(2024, 1, 1)), Calendar.validDateRange[1])
+        self.assertFalse(Validation.isTrusted())
+
+    def test_validation(self):
+        # Dates are validated once on entry
+        with self.assertRaises(ValueError):
+            with trusted([date(2024, 1, 1), date(2057, 1, 1)]):
+                pass
+        self.assertFalse(Validation.isTrusted())
+
+        # Trusted mode needs the dates it vouches for
+        with self.assertRaises(ValueError):
+            with trusted():
+                pass
+
+        with trusted([date(2056, 12, 20)]):
+            # Range checks are skipped, but lookups past the business-day tables still raise
+            Calendar.validateDateRange(date(2057, 1, 1))
+            with self.assertRaises(ValueError):
+                self.calendar.isBusinessDay(date(2057, 1, 1))
+            with self.assertRaises(ValueError):
+                self.calendar.addBusinessDays(date(2056, 12, 20), 30)
+            with self.assertRaises(ValueError):
+                self.calendar.addTenor(date(2056, 12, 20), "1m", "f", False)
+            # Reversed dates are still rejected
+            with self.assertRaises(ValueError):
+                Calendar.validateDateRange(date(2025, 1, 1), date(2024, 1, 1))
+            with self.assertRaises(ValueError):
+                self.calendar.numBusinessDaysBetween(date(2025, 1, 1), date(2024, 1, 1))
+            with self.assertRaises(ValueError):
+                self.calendar.getHolidaysData(date(2025, 1, 1), date(2024, 1, 1))
+            with self.assertRaises(ValueError):
+                DayCountBasis('act/365').dayCountFraction(date(2025, 1, 1), date(2024, 1, 1))
+        with self.assertRaises(ValueError):
+            Calendar.validateDateRange(date(2057, 1, 1))
+
+    def test_otherThreads(self):
+        # Trusted mode only applies to the thread that entered it
+        errors = []
+
+        def query():
+            for call in (lambda: self.calendar.numBusinessDaysBetween(date(2025, 1, 1), date(2024, 1, 1)),
+                         lambda: DayCountBasis('act/365').dayCountFraction(date(2024, 1, 1), date(2057, 1, 1))):
+                try:
+                    call()
+                except ValueError as error:
+                    errors.append(error)
+
+        with trusted([date(2024, 1, 1), date(2025, 1, 1)]):
+            thread = threading.Thread(target=query)
+            thread.start()
+            thread.join()
+            self.assertEqual(DayCountBasis('act/365').dayCountFraction(date(2024, 1, 1), date(2057, 1, 1)), 12054 / 365.0)
+        self.assertEqual(len(errors), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()